@@ -1,14 +1,55 @@
+import importlib
 import os
+import threading
+from typing import Any, Dict, List, Optional
 
-from external_api.data_sources import *
-from external_api.function_utils import MCP_FUNCTION_LIST_JSON_FILE, ToolResult, load_function_proxys
+from external_api.function_utils import MCP_FUNCTION_LIST_JSON_FILE, FunctionProxy, ToolResult, load_function_infos
 
-proxies = {}
-_, proxies = load_function_proxys(os.path.join(os.path.dirname(__file__), MCP_FUNCTION_LIST_JSON_FILE))
-globals().update(proxies)
+# function list 在首次访问时才加载，FunctionProxy 在首次访问对应函数时才创建
+proxies: Dict[str, FunctionProxy] = {}
+_function_infos: Optional[Dict[str, Dict[str, Any]]] = None
+_lock = threading.Lock()
+
+
+def _get_function_infos() -> Dict[str, Dict[str, Any]]:
+    global _function_infos
+    if _function_infos is None:
+        with _lock:
+            if _function_infos is None:  # Double-check
+                _, _function_infos = load_function_infos(os.path.join(os.path.dirname(__file__), MCP_FUNCTION_LIST_JSON_FILE))
+    return _function_infos
+
+
+def _get_all() -> List[str]:
+    return ["ToolResult"] + list(_get_function_infos().keys())
+
+
+def __getattr__(name: str) -> Any:
+    if name == "__all__":
+        return _get_all()
+    if name == "data_sources":
+        return importlib.import_module(".data_sources", __name__)
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    function_info = _get_function_infos().get(name)
+    if function_info is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    with _lock:
+        proxy = proxies.get(name)
+        if proxy is None:
+            proxy = FunctionProxy(function_info)
+            proxies[name] = proxy
+    # 缓存到模块属性，之后的访问不再经过 __getattr__
+    globals()[name] = proxy
+    return proxy
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_get_function_infos().keys()))
 
-__all__ = ["ToolResult"] + list(proxies.keys())
 
 if __name__ == "__main__":
-    print(__all__)
+    print(_get_all())
     print(globals())
@@ -0,0 +1,18 @@
+"""
+预热 function list 缓存
+
+用法: python -m external_api [file_path]
+"""
+
+import argparse
+import os
+
+from external_api.function_utils import FUNCTION_LIST_CACHE_SUFFIX, MCP_FUNCTION_LIST_JSON_FILE, prewarm_function_list_cache
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prewarm the function list cache")
+    parser.add_argument("file_path", nargs="?", default=os.path.join(os.path.dirname(__file__), MCP_FUNCTION_LIST_JSON_FILE))
+    args = parser.parse_args()
+
+    function_infos = prewarm_function_list_cache(args.file_path)
+    print(f"Cached {len(function_infos)} functions to {args.file_path}{FUNCTION_LIST_CACHE_SUFFIX}")
@@ -6,17 +6,37 @@ BaseApi (基类)
 """
 import inspect
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 import os
 
 
-EXCLUDE_METHODS = ['get_capabilities', 'get_api_info', 'source_name', 'get_source_info']
+EXCLUDE_METHODS = ['get_capabilities', 'get_api_info', 'source_name', 'get_source_info', 'aclose']
+
+NOT_IMPLEMENTED_MARKER = '__not_implemented__'
+
+
+def not_implemented(func: Callable) -> Callable:
+    """
+    标记数据源方法尚未实现，get_capabilities 会跳过被标记的方法
+    """
+    setattr(func, NOT_IMPLEMENTED_MARKER, True)
+    return func
+
 
 class BaseAPI(ABC):
     """
     数据源基类
     所有数据源都需要继承此类并实现相关方法
     """
+
+    # 每个子类的能力描述缓存，由 get_capabilities 首次调用时填充
+    _capabilities: Optional[List[Dict[str, Any]]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # 子类各自持有缓存，避免继承父类已计算的结果
+        cls._capabilities = None
+
     @abstractmethod
     def __init__(self, config: Dict[str, Any]):
         """
@@ -50,22 +70,32 @@ class BaseAPI(ABC):
     def get_capabilities(self) -> List[Dict[str, Any]]:
         """
         获取数据源所有能力的描述
-        通过扫描实例方法及其文档字符串自动获取能力描述
+        通过扫描类方法及其文档字符串自动获取能力描述，结果按类缓存，只在首次调用时计算
 
         Returns:
             List[Dict[str, Any]]: 数据源提供的所有方法的描述列表
         """
+        cls = type(self)
+        if cls._capabilities is None:
+            cls._capabilities = cls._collect_capabilities()
+        return list(cls._capabilities)
+
+    @classmethod
+    def _collect_capabilities(cls) -> List[Dict[str, Any]]:
+        """
+        扫描类的公开方法，构建能力描述列表
+        """
         # 获取所有公开方法（不包括内置方法和私有方法）
         capabilities = []
-        for attr_name in dir(self):
+        for attr_name in dir(cls):
             if not attr_name.startswith('_'):  # 排除私有方法
-                attr = getattr(self, attr_name)
+                attr = getattr(cls, attr_name)
                 if callable(attr) and attr_name not in EXCLUDE_METHODS:
                     # 获取方法的文档字符串
                     doc = inspect.getdoc(attr)
                     if not doc:  # 跳过没有文档的方法
                         continue
-                    if 'raise NotImplementedError' in inspect.getsource(attr):  # 跳过未实现的方法
+                    if getattr(attr, NOT_IMPLEMENTED_MARKER, False):  # 跳过未实现的方法
                         continue
                     # 获取方法的签名
                     sig = inspect.signature(attr)
@@ -82,4 +112,4 @@ class BaseAPI(ABC):
                         "doc": doc  # 完整的文档字符串
                     }
                     capabilities.append(capability)
-        return capabilities
\ No newline at end of file
+        return capabilities
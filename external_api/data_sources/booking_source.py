@@ -4,15 +4,36 @@ Booking.com flight search data source implementation
 
 import asyncio
 import logging
+import re
+import unicodedata
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import aiohttp
 
 from .base import BaseAPI
+from .cache import cached, get_response_cache
 
 logger = logging.getLogger("booking_source")
 
+# 目的地 ID 基本不变，解析结果缓存 30 天
+DESTINATION_CACHE_TTL = 30 * 24 * 3600
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 多页酒店搜索最多请求的页数
+MAX_HOTEL_PAGES = 50
+
+# 酒店详情可选择解析的部分
+HOTEL_DETAIL_SECTIONS = ("basic", "price", "rooms", "room_photos", "facilities", "important_information")
+
+
+def _normalize_dest_name(dest_name: str) -> str:
+    """Normalize a destination name for cache lookup: strip accents and punctuation, ignore case and extra spaces"""
+    decomposed = unicodedata.normalize("NFKD", dest_name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+    return _WHITESPACE_RE.sub(" ", _PUNCTUATION_RE.sub(" ", stripped)).strip()
+
 
 class BookingSource(BaseAPI):
     """Booking.com data source"""
@@ -52,6 +73,7 @@ class BookingSource(BaseAPI):
             "description": "Booking.com data source, providing flight search and hotel search services",
         }
 
+    @cached(ttl=600)
     async def search_flights(
         self,
         from_code: str,
@@ -233,6 +255,157 @@ class BookingSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    async def search_flight_matrix(
+        self,
+        from_code: str,
+        to_code: str,
+        depart_dates: List[str],
+        return_dates: Optional[List[str]] = None,
+        stops: str = "none",
+        adults: int = 1,
+        children: Optional[str] = None,
+        cabin_class: str = "ECONOMY",
+        currency_code: str = "USD",
+        include_offers: bool = False,
+        max_concurrency: int = 4,
+        requests_per_second: Optional[float] = 5,
+    ) -> Dict[str, Any]:
+        """
+        Search flights for every combination of departure and return dates concurrently and return the cheapest offer per date pair
+
+        Args:
+            from_code(str): Departure airport code, e.g.: PEK
+            to_code(str): Destination airport code, e.g.: CAN
+            depart_dates(List[str]): Departure dates, format: YYYY-MM-DD
+            return_dates(Optional[List[str]]): Return dates, format: YYYY-MM-DD, one-way when omitted, pairs returning before departure are skipped
+            stops(str): Number of stops, options: none, 0, 1, 2
+            adults(int): Number of adults, default is 1
+            children(Optional[str]): Children's ages, comma separated, e.g.: 0,17 (optional)
+            cabin_class(str): Cabin class, options: ECONOMY, PREMIUM_ECONOMY, BUSINESS, FIRST
+            currency_code(str): Currency code, default USD
+            include_offers(bool): Include all offers of each date pair, default is False. Without it, the offers of a
+                date pair can be fetched later with search_flights(..., sort="CHEAPEST"), which is served from cache
+            max_concurrency(int): Maximum number of searches running at the same time, default is 4
+            requests_per_second(Optional[float]): Maximum number of searches started per second, default is 5, None for no limit
+
+        Returns:
+            Dict[str, Any]: Dictionary containing the price matrix, e.g.
+            {
+                "success": True,                   # Whether successful
+                "data": {                          # If successful, contains the following fields
+                    "cells": [                     # One item per date pair, in order of depart_dates then return_dates
+                        {
+                            "depart_date": "2025-04-19",
+                            "return_date": "2025-04-26",  # None for one-way
+                            "offer_count": 15,     # Number of offers found
+                            "cheapest": {          # Cheapest offer, same format as search_flights, None if no offers
+                                "stops": 0,
+                                "segments": [...],
+                                "total_time": "3h5m",
+                                "price": {"currency": "USD", "amount": 435.21}
+                            },
+                            "offers": [...]        # Only when include_offers is True
+                        }
+                    ],
+                    "cheapest": {...},             # Cheapest cell overall, None if no offers
+                    "failed_cells": [              # Date pairs that failed
+                        {"depart_date": "2025-04-20", "return_date": "2025-04-26", "error": "Request timeout (timeout=60s)"}
+                    ]
+                }
+            }
+        """
+
+        # Example:
+        #     >>> from external_api.data_sources.client import get_client
+        #     >>> client = get_client()
+        #     >>> result = await client.booking.search_flight_matrix(
+        #     ...     from_code="PEK",
+        #     ...     to_code="CAN",
+        #     ...     depart_dates=["2025-04-18", "2025-04-19", "2025-04-20"],
+        #     ...     return_dates=["2025-04-25", "2025-04-26"]
+        #     ... )
+        # """
+        try:
+            date_pairs = [
+                (depart_date, return_date)
+                for depart_date in depart_dates
+                for return_date in (return_dates or [None])
+                if return_date is None or return_date >= depart_date
+            ]
+
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+            loop = asyncio.get_running_loop()
+            interval = 1 / requests_per_second if requests_per_second else 0
+            rate_lock = asyncio.Lock()
+            next_start = loop.time()
+
+            async def wait_rate_limit():
+                # 按固定间隔错开请求的开始时间
+                nonlocal next_start
+                async with rate_lock:
+                    now = loop.time()
+                    delay = next_start - now
+                    next_start = max(now, next_start) + interval
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            async def search_cell(depart_date: str, return_date: Optional[str]) -> Dict[str, Any]:
+                async with semaphore:
+                    await wait_rate_limit()
+                    return await self.search_flights(
+                        from_code=from_code,
+                        to_code=to_code,
+                        depart_date=depart_date,
+                        return_date=return_date,
+                        stops=stops,
+                        adults=adults,
+                        children=children,
+                        sort="CHEAPEST",
+                        cabin_class=cabin_class,
+                        currency_code=currency_code,
+                    )
+
+            results = await asyncio.gather(*(search_cell(*date_pair) for date_pair in date_pairs), return_exceptions=True)
+
+            cells = []
+            failed_cells = []
+            for (depart_date, return_date), result in zip(date_pairs, results):
+                if isinstance(result, Exception) or not result["success"]:
+                    error = str(result) if isinstance(result, Exception) else result["error"]
+                    failed_cells.append({"depart_date": depart_date, "return_date": return_date, "error": error})
+                    continue
+
+                offers = result["data"]["flights"]
+                cell = {
+                    "depart_date": depart_date,
+                    "return_date": return_date,
+                    "offer_count": len(offers),
+                    "cheapest": min(offers, key=lambda offer: offer["price"]["amount"]) if offers else None,
+                }
+                if include_offers:
+                    cell["offers"] = offers
+                cells.append(cell)
+
+            # If all date pairs fail
+            if date_pairs and len(failed_cells) == len(date_pairs):
+                error_msg = "All flight searches failed:\n" + "\n".join(
+                    [f"{failed['depart_date']}/{failed['return_date']}: {failed['error']}" for failed in failed_cells]
+                )
+                return {"success": False, "error": error_msg}
+
+            priced_cells = [cell for cell in cells if cell["cheapest"] is not None]
+            cheapest = min(priced_cells, key=lambda cell: cell["cheapest"]["price"]["amount"]) if priced_cells else None
+            if cheapest is not None:
+                cheapest = {key: value for key, value in cheapest.items() if key != "offers"}
+
+            return {"success": True, "data": {"cells": cells, "cheapest": cheapest, "failed_cells": failed_cells}}
+
+        except Exception as e:
+            error_msg = f"Error occurred while searching flight matrix: {str(e)}"
+            logger.error(error_msg)
+            logger.exception(e)
+            return {"success": False, "error": error_msg}
+
     async def _search_hotel_destinations(self, query: str) -> Dict[str, Any]:
         """
         Search for hotel destinations
@@ -325,6 +498,35 @@ class BookingSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    async def _resolve_destination(self, dest_name: str) -> Dict[str, Any]:
+        """
+        Resolve a destination name to the first matching destination, results are cached by normalized name
+
+        Returns:
+            Dict[str, Any]: {"success": True, "data": {"name": ..., "dest_id": ..., "search_type": ...}} or {"success": False, "error": ...}
+        """
+        cache = get_response_cache()
+        cache_key = f"BookingSource._resolve_destination:{self.proxy_url}:{_normalize_dest_name(dest_name)}"
+        if cache is not None:
+            destination = await cache.get(cache_key)
+            cache.record("BookingSource._resolve_destination", hit=destination is not None)
+            if destination is not None:
+                return {"success": True, "data": destination}
+
+        dest_result = await self._search_hotel_destinations(dest_name)
+        if not dest_result["success"]:
+            return dest_result
+
+        if not dest_result["data"]["destinations"]:
+            return {"success": False, "error": f"No matching destination found: {dest_name}"}
+
+        # 使用第一个匹配的目的地
+        first = dest_result["data"]["destinations"][0]
+        destination = {"name": first["name"], "dest_id": first["dest_id"], "search_type": first["search_type"]}
+        if cache is not None:
+            await cache.set(cache_key, destination, DESTINATION_CACHE_TTL)
+        return {"success": True, "data": destination}
+
     async def _search_hotels_by_destid(
         self,
         dest_id: str,
@@ -395,7 +597,8 @@ class BookingSource(BaseAPI):
                                 "price_per_night": 879.39 # Price per night
                             }
                         }
-                    ]
+                    ],
+                    "total_count": 1234            # Total hotels found, None if not reported
                 }
             }
         """
@@ -497,7 +700,7 @@ class BookingSource(BaseAPI):
                     }
                 )
 
-            return {"success": True, "data": {"hotels": simplified_hotels}}
+            return {"success": True, "data": {"hotels": simplified_hotels, "total_count": self._parse_total_count(data["data"])}}
 
         except Exception as e:
             error_msg = f"Error occurred while searching hotels: {str(e)}"
@@ -505,6 +708,7 @@ class BookingSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    @cached(ttl=1800)
     async def search_hotels_by_dest_name(
         self,
         dest_name: str,
@@ -520,6 +724,9 @@ class BookingSource(BaseAPI):
         currency_code: str = "USD",
         sort_by: str = "bayesian_review_score",
         categories_filter: Optional[str] = None,
+        all_pages: bool = False,
+        max_results: Optional[int] = None,
+        max_concurrency: int = 4,
     ) -> Dict[str, Any]:
         """
         Search for hotels by destination name
@@ -547,9 +754,13 @@ class BookingSource(BaseAPI):
             categories_filter(Optional[str]): Star rating filter, options:
                 - class::1: One star, ..., class::5: Five stars
                 - Multiple selection allowed, comma separated, e.g.: class::1,class::2
+            all_pages(bool): Fetch all pages starting from page_number concurrently and merge them, default is False
+            max_results(Optional[int]): Fetch pages starting from page_number concurrently until this many hotels are collected, optional
+            max_concurrency(int): Maximum number of pages requested at the same time when fetching multiple pages, default is 4
 
         Returns:
-            Dict[str, Any]: Dictionary containing hotel search results, e.g.
+            Dict[str, Any]: Dictionary containing hotel search results, when fetching multiple pages "data" also contains
+            "total_count" (total hotels reported by Booking) and "failed_pages", e.g.
             {
                 "success": True,                   # Whether successful
                 "data": {                          # If successful, contains the following fields
@@ -595,59 +806,122 @@ class BookingSource(BaseAPI):
         #     ...     print(f"Search successful")
         # """
         try:
-            # 先搜索目的地信息
-            dest_result = await self._search_hotel_destinations(dest_name)
+            # 先解析目的地信息
+            dest_result = await self._resolve_destination(dest_name)
             if not dest_result["success"]:
                 return dest_result
 
-            if not dest_result["data"]["destinations"]:
-                return {"success": False, "error": f"No matching destination found: {dest_name}"}
-
-            # 使用第一个匹配的目的地
-            destination = dest_result["data"]["destinations"][0]
+            destination = dest_result["data"]
             dest_id = destination["dest_id"]
             search_type = destination["search_type"].upper()
 
+            async def search_page(page: int) -> Dict[str, Any]:
+                return await self._search_hotels_by_destid(
+                    dest_id=dest_id,
+                    search_type=search_type,
+                    arrival_date=arrival_date,
+                    departure_date=departure_date,
+                    adults=adults,
+                    children_age=children_age,
+                    room_qty=room_qty,
+                    page_number=page,
+                    price_min=price_min,
+                    price_max=price_max,
+                    languagecode=languagecode,
+                    currency_code=currency_code,
+                    sort_by=sort_by,
+                    categories_filter=categories_filter,
+                )
+
             # 搜索酒店
-            hotels_result = await self._search_hotels_by_destid(
-                dest_id=dest_id,
-                search_type=search_type,
-                arrival_date=arrival_date,
-                departure_date=departure_date,
-                adults=adults,
-                children_age=children_age,
-                room_qty=room_qty,
-                page_number=page_number,
-                price_min=price_min,
-                price_max=price_max,
-                languagecode=languagecode,
-                currency_code=currency_code,
-                sort_by=sort_by,
-                categories_filter=categories_filter,
-            )
+            hotels_result = await search_page(page_number)
 
             if not hotels_result["success"]:
                 return hotels_result
 
             # 在返回结果中添加目的地信息
-            return {
-                "success": True,
-                "data": {
-                    "destination": {
-                        "name": destination["name"],
-                        "dest_id": destination["dest_id"],
-                        "search_type": destination["search_type"],
-                    },
-                    "hotels": hotels_result["data"]["hotels"],
+            result_data = {
+                "destination": {
+                    "name": destination["name"],
+                    "dest_id": destination["dest_id"],
+                    "search_type": destination["search_type"],
                 },
+                "hotels": hotels_result["data"]["hotels"],
             }
 
+            if all_pages or max_results is not None:
+                total_count = hotels_result["data"]["total_count"]
+                hotels, failed_pages = await self._search_remaining_pages(
+                    search_page, page_number, hotels_result["data"]["hotels"], total_count, max_results, max_concurrency
+                )
+                result_data.update({"hotels": hotels, "total_count": total_count, "failed_pages": failed_pages})
+
+            return {"success": True, "data": result_data}
+
         except Exception as e:
             error_msg = f"Error occurred while searching hotels: {str(e)}"
             logger.error(error_msg)
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    async def _search_remaining_pages(
+        self,
+        search_page: Callable[[int], Awaitable[Dict[str, Any]]],
+        first_page: int,
+        first_hotels: List[Dict[str, Any]],
+        total_count: Optional[int],
+        max_results: Optional[int],
+        max_concurrency: int,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Fetch the pages after first_page concurrently, merge them in page order and dedupe by hotel_id
+
+        Returns:
+            Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: (hotels, failed_pages)
+        """
+        page_size = len(first_hotels)
+        # 第一页之后还需要的结果数：total_count 从第 1 页算起，扣除 first_page 及之前的页；max_results 只扣除已取得的一页
+        remaining_counts = []
+        if total_count is not None:
+            remaining_counts.append(total_count - first_page * page_size)
+        if max_results is not None:
+            remaining_counts.append(max_results - page_size)
+        if not page_size or not remaining_counts:
+            if not remaining_counts:
+                logger.warning("Total hotel count not found in response, only the first page is returned")
+            return first_hotels[:max_results] if max_results is not None else first_hotels, []
+
+        remaining = max(0, min(remaining_counts))
+        page_count = min(-(-remaining // page_size), MAX_HOTEL_PAGES - 1)
+        pages = list(range(first_page + 1, first_page + 1 + page_count))
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def fetch_page(page: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await search_page(page)
+
+        results = await asyncio.gather(*(fetch_page(page) for page in pages), return_exceptions=True)
+
+        hotels = []
+        seen_ids = set()
+        failed_pages = []
+        for page, page_result in zip([first_page] + pages, [{"success": True, "data": {"hotels": first_hotels}}] + results):
+            if isinstance(page_result, Exception) or not page_result["success"]:
+                error = str(page_result) if isinstance(page_result, Exception) else page_result["error"]
+                logger.warning(f"Failed to search hotels page {page}: {error}")
+                failed_pages.append({"page_number": page, "error": error})
+                continue
+            for hotel in page_result["data"]["hotels"]:
+                if hotel["hotel_id"] not in seen_ids:
+                    seen_ids.add(hotel["hotel_id"])
+                    hotels.append(hotel)
+
+        if max_results is not None:
+            hotels = hotels[:max_results]
+        return hotels, failed_pages
+
+    @cached(ttl=6 * 3600)
     async def search_hotel_details(
         self,
         hotel_id: str,
@@ -660,6 +934,7 @@ class BookingSource(BaseAPI):
         temperature_unit: str = "c",
         languagecode: str = "en-us",
         currency_code: str = "EUR",
+        sections: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """
         Search for hotel details by hotel ID
@@ -675,6 +950,14 @@ class BookingSource(BaseAPI):
             temperature_unit(str): Temperature unit, default is c, options: c or f, where c = Celsius, f = Fahrenheit
             languagecode(str): Language code, default en-us
             currency_code(str): Currency code, default EUR
+            sections(Optional[List[str]]): Only parse and return these sections, hotel_id and hotel_name are always returned, options:
+                - basic: address, location, rating and other hotel fields
+                - price: total and per night price
+                - rooms: room descriptions and bed configurations
+                - room_photos: room photos, only used together with rooms
+                - facilities: facilities list
+                - important_information: important notices
+                default is None for all sections
 
         Returns:
             Dict[str, Any]: Dictionary containing hotel details, e.g.
@@ -698,6 +981,11 @@ class BookingSource(BaseAPI):
                     "currency_code": "INR",        # Currency code
                     "zip": "400049",               # Postal code
                     "timezone": "Asia/Kolkata",    # Timezone
+                    "price": {                     # Price information, None if not available
+                        "currency": "INR",         # Currency
+                        "amount": 8850.5,          # Total price
+                        "amount_per_night": 8850.5 # Price per night
+                    },
                     "rooms": {                     # Room information
                         "19160501": {
                             "photos": ["https://...", ...], # Room photos
@@ -726,7 +1014,7 @@ class BookingSource(BaseAPI):
                     "family_facilities": [...],    # Family facilities
                     "facilities": [...],           # Facilities list
                     "spoken_languages": [...],     # Available languages
-                    "hotel_important_information_with_codes": [...], # Important notices
+                    "hotel_important_information": [...], # Important notices
                 }
             }
         """
@@ -745,6 +1033,11 @@ class BookingSource(BaseAPI):
         #     ... else:
         #     ...     print(f"请求成功")
         # """
+        if sections is not None:
+            unknown_sections = [section for section in sections if section not in HOTEL_DETAIL_SECTIONS]
+            if unknown_sections:
+                return {"success": False, "error": f"Unknown sections: {unknown_sections}, options: {list(HOTEL_DETAIL_SECTIONS)}"}
+
         try:
             # 请求酒店详情
             # 构建请求参数
@@ -788,7 +1081,7 @@ class BookingSource(BaseAPI):
                 logger.error(f"API returned error: {error_msg}")
                 return {"success": False, "error": error_msg}
 
-            hotel_detail = self._parse_hotel_detail(data.get("data", {}))
+            hotel_detail = self._parse_hotel_detail(data.get("data", {}), sections)
             return {"success": True, "data": hotel_detail}
         except Exception as e:
             error_msg = f"Error occurred while searching hotel details: {str(e)}"
@@ -796,31 +1089,187 @@ class BookingSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
-    def _parse_hotel_detail(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """解析酒店详情"""
-        facilities = []
-        for facility in data.get("facilities_block", {}).get("facilities", []):
-            facility_name = facility.get("name", "")
-            if len(facility_name) > 0:
-                facilities.append(facility_name)
+    async def search_hotels_details(
+        self,
+        hotel_ids: List[str],
+        arrival_date: str,
+        departure_date: str,
+        adults: int = 1,
+        children_age: Optional[str] = None,
+        room_qty: int = 1,
+        languagecode: str = "en-us",
+        currency_code: str = "EUR",
+        sections: Optional[List[str]] = None,
+        max_concurrency: int = 8,
+    ) -> Dict[str, Any]:
+        """
+        Search for details of multiple hotels concurrently, e.g. to enrich the results of search_hotels_by_dest_name
 
-        hotel_important_information = []
-        for item in data.get("hotel_important_information_with_codes", []):
-            info = item.get("phrase", "")
-            if len(info) > 0:
-                hotel_important_information.append(info)
+        Args:
+            hotel_ids(List[str]): Hotel ID list, repeated IDs are only requested once
+            arrival_date(str): Check-in date, format: YYYY-MM-DD
+            departure_date(str): Check-out date, format: YYYY-MM-DD
+            adults(int): Number of adults, default is 1
+            children_age(Optional[str]): Children's ages, comma separated, e.g.: 0,17
+            room_qty(int): Number of rooms, default is 1
+            languagecode(str): Language code, default en-us
+            currency_code(str): Currency code, default EUR
+            sections(Optional[List[str]]): Only parse and return these sections, same options as search_hotel_details,
+                e.g. ["price", "facilities"], default is None for all sections
+            max_concurrency(int): Maximum number of hotels requested at the same time, default is 8
 
+        Returns:
+            Dict[str, Any]: Dictionary containing hotel details, each hotel has the same content as the "data" of
+            search_hotel_details, hotels keep the order of hotel_ids, e.g.
+            {
+                "success": True,                   # Whether successful
+                "data": {                          # If successful, contains the following fields
+                    "count": 1,                    # Number of hotels returned
+                    "hotels": [                    # Hotel details list
+                        {"hotel_id": 191605, "hotel_name": "Novotel Mumbai Juhu Beach", "price": {...}, "facilities": [...]}
+                    ],
+                    "failed_hotel_ids": [          # Hotels that failed
+                        {"hotel_id": "123", "error": "Request timeout (timeout=60s)"}
+                    ]
+                }
+            }
+        """
+        try:
+            unique_hotel_ids = list(dict.fromkeys(str(hotel_id) for hotel_id in hotel_ids))
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def fetch_hotel_detail(hotel_id: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self.search_hotel_details(
+                        hotel_id=hotel_id,
+                        arrival_date=arrival_date,
+                        departure_date=departure_date,
+                        adults=adults,
+                        children_age=children_age,
+                        room_qty=room_qty,
+                        languagecode=languagecode,
+                        currency_code=currency_code,
+                        sections=sections,
+                    )
+
+            results = await asyncio.gather(*(fetch_hotel_detail(hotel_id) for hotel_id in unique_hotel_ids), return_exceptions=True)
+
+            hotels = []
+            failed_hotel_ids = []
+            for hotel_id, result in zip(unique_hotel_ids, results):
+                if isinstance(result, Exception):
+                    failed_hotel_ids.append({"hotel_id": hotel_id, "error": str(result)})
+                    logger.error(f"Error occurred while searching details of hotel {hotel_id}: {str(result)}")
+                elif result["success"]:
+                    hotels.append(result["data"])
+                else:
+                    failed_hotel_ids.append({"hotel_id": hotel_id, "error": result["error"]})
+
+            # If all hotels fail
+            if unique_hotel_ids and len(failed_hotel_ids) == len(unique_hotel_ids):
+                error_msg = "All hotel details retrieval failed:\n" + "\n".join(
+                    [f"{failed['hotel_id']}: {failed['error']}" for failed in failed_hotel_ids]
+                )
+                return {"success": False, "error": error_msg}
+
+            return {"success": True, "data": {"count": len(hotels), "hotels": hotels, "failed_hotel_ids": failed_hotel_ids}}
+
+        except Exception as e:
+            error_msg = f"Error occurred while searching hotels details: {str(e)}"
+            logger.error(error_msg)
+            logger.exception(e)
+            return {"success": False, "error": error_msg}
+
+    def _parse_hotel_detail(self, data: Dict[str, Any], sections: Optional[List[str]] = None) -> Dict[str, Any]:
+        """解析酒店详情，sections 为 None 时解析所有部分，否则只解析指定的部分"""
+        selected = set(HOTEL_DETAIL_SECTIONS if sections is None else sections)
+
+        hotel_detail = {
+            "hotel_id": data.get("hotel_id", ""),  # 酒店 id
+            "hotel_name": data.get("hotel_name", ""),  # 酒店名称
+        }
+
+        if "basic" in selected:
+            hotel_detail.update(
+                {
+                    "url": data.get("url", ""),  # 酒店url
+                    "review_nr": data.get("review_nr", ""),  # 评论数量
+                    "rating": data.get("raw_data", {}).get("reviewScore", ""),  # 综合评分
+                    "arrival_date": data.get("arrival_date", ""),  # 入住日期
+                    "departure_date": data.get("departure_date", ""),  # 离开日期
+                    "latitude": data.get("latitude", ""),  # 经度
+                    "longitude": data.get("longitude", ""),  # 纬度
+                    "address": data.get("address", ""),  # 地址
+                    "city": data.get("city", ""),  # 城市名
+                    "district": data.get("district", "") if data.get("district", "") != data.get("city", "") else "",  # 地址所在区
+                    "countrycode": data.get("countrycode", ""),  # 国家代码
+                    "country_trans": data.get("country_trans", ""),  # 国家名
+                    "currency_code": data.get("currency_code", ""),  # 货币代码
+                    "zip": data.get("zip", ""),  # 邮政编码
+                    "timezone": data.get("timezone", ""),  # 时区
+                    "soldout": data.get("soldout", ""),  # 是否售罄
+                    "available_rooms": data.get("available_rooms", ""),  # 可用房间数
+                    "max_rooms_in_reservation": data.get("max_rooms_in_reservation", ""),  # 最大预订房间数
+                    "average_room_size_for_ufi_m2": data.get("average_room_size_for_ufi_m2", ""),  # 平均房间大小
+                    "is_family_friendly": data.get("is_family_friendly", ""),  # 是否家庭友好
+                    "is_closed": data.get("is_closed", ""),  # 是否关门
+                    "is_cash_accepted_check_enabled": data.get("is_cash_accepted_check_enabled", ""),  # 是否接受现金
+                    "hotel_include_breakfast": data.get("hotel_include_breakfast", ""),  # 是否包含早餐
+                    "family_facilities": data.get("family_facilities", ""),  # 家庭设施
+                    "spoken_languages": data.get("spoken_languages", []),  # 可用语言
+                }
+            )
+
+        if "price" in selected:
+            hotel_detail["price"] = self._parse_hotel_price(data)
+
+        if "facilities" in selected:
+            facilities = []
+            for facility in data.get("facilities_block", {}).get("facilities", []):
+                facility_name = facility.get("name", "")
+                if len(facility_name) > 0:
+                    facilities.append(facility_name)
+            hotel_detail["facilities"] = facilities
+
+        if "important_information" in selected:
+            hotel_important_information = []
+            for item in data.get("hotel_important_information_with_codes", []):
+                info = item.get("phrase", "")
+                if len(info) > 0:
+                    hotel_important_information.append(info)
+            hotel_detail["hotel_important_information"] = hotel_important_information
+
+        if "rooms" in selected:
+            hotel_detail["rooms"] = self._parse_rooms(data, include_photos="room_photos" in selected)
+
+        return hotel_detail
+
+    def _parse_hotel_price(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """解析酒店总价和每晚价格"""
+        price_breakdown = data.get("product_price_breakdown") or data.get("composite_price_breakdown") or {}
+        gross_amount = price_breakdown.get("gross_amount") or {}
+        if gross_amount.get("value") is None:
+            return None
+        return {
+            "currency": gross_amount.get("currency", ""),
+            "amount": gross_amount.get("value"),
+            "amount_per_night": (price_breakdown.get("gross_amount_per_night") or {}).get("value"),
+        }
+
+    def _parse_rooms(self, data: Dict[str, Any], include_photos: bool = True) -> Dict[str, Any]:
+        """解析房间信息，房间照片较多，不需要时跳过"""
         rooms = {}
         for roomId, roomInfo in data.get("rooms", {}).items():
             room = {}
-            photos_data = roomInfo.get("photos", [])
-            photos = []
-            for photo in photos_data:
-                url = photo.get("url_max1280", "")
-                if len(url) == 0:
-                    url = photo.get("url_original", "")
-                if len(url) > 0:
-                    photos.append(url)
+            if include_photos:
+                photos = []
+                for photo in roomInfo.get("photos", []):
+                    url = photo.get("url_max1280", "")
+                    if len(url) == 0:
+                        url = photo.get("url_original", "")
+                    if len(url) > 0:
+                        photos.append(url)
+                room["photos"] = photos
 
             children_and_beds_text = {}
             for key, value in roomInfo.get("children_and_beds_text", {}).items():
@@ -832,8 +1281,6 @@ class BookingSource(BaseAPI):
                 elif isinstance(value, int):
                     children_and_beds_text[key] = value
 
-            description = roomInfo.get("description", "")
-
             bed_configurations = []
             for bed_config in roomInfo.get("bed_configurations", []):
                 for bed_type in bed_config.get("bed_types", []):
@@ -841,47 +1288,22 @@ class BookingSource(BaseAPI):
                     bed_desc = bed_type.get("description", "")
                     bed_configurations.append({"name_with_count": bed_name_cnt, "description": bed_desc})
 
-            room = {
-                "photos": photos,
-                "children_and_beds_text": children_and_beds_text,
-                "description": description,
-                "bed_configurations": bed_configurations,
-            }
+            room.update(
+                {
+                    "children_and_beds_text": children_and_beds_text,
+                    "description": roomInfo.get("description", ""),
+                    "bed_configurations": bed_configurations,
+                }
+            )
             rooms[roomId] = room
-
-        hotel_detail = {
-            "hotel_id": data.get("hotel_id", ""),  # 酒店 id
-            "hotel_name": data.get("hotel_name", ""),  # 酒店名称
-            "url": data.get("url", ""),  # 酒店url
-            "review_nr": data.get("review_nr", ""),  # 评论数量
-            "rating": data.get("raw_data", {}).get("reviewScore", ""),  # 综合评分
-            "arrival_date": data.get("arrival_date", ""),  # 入住日期
-            "departure_date": data.get("departure_date", ""),  # 离开日期
-            "latitude": data.get("latitude", ""),  # 经度
-            "longitude": data.get("longitude", ""),  # 纬度
-            "address": data.get("address", ""),  # 地址
-            "city": data.get("city", ""),  # 城市名
-            "district": data.get("district", "") if data.get("district", "") != data.get("city", "") else "",  # 地址所在区
-            "countrycode": data.get("countrycode", ""),  # 国家代码
-            "country_trans": data.get("country_trans", ""),  # 国家名
-            "currency_code": data.get("currency_code", ""),  # 货币代码
-            "zip": data.get("zip", ""),  # 邮政编码
-            "timezone": data.get("timezone", ""),  # 时区
-            "soldout": data.get("soldout", ""),  # 是否售罄
-            "available_rooms": data.get("available_rooms", ""),  # 可用房间数
-            "max_rooms_in_reservation": data.get("max_rooms_in_reservation", ""),  # 最大预订房间数
-            "average_room_size_for_ufi_m2": data.get("average_room_size_for_ufi_m2", ""),  # 平均房间大小
-            "is_family_friendly": data.get("is_family_friendly", ""),  # 是否家庭友好
-            "is_closed": data.get("is_closed", ""),  # 是否关门
-            "is_cash_accepted_check_enabled": data.get("is_cash_accepted_check_enabled", ""),  # 是否接受现金
-            "hotel_include_breakfast": data.get("hotel_include_breakfast", ""),  # 是否包含早餐
-            "family_facilities": data.get("family_facilities", ""),  # 家庭设施
-            "facilities": facilities,
-            "spoken_languages": data.get("spoken_languages", []),  # 可用语言
-            "hotel_important_information": hotel_important_information,
-            "rooms": rooms,
-        }
-        return {"success": True, "data": hotel_detail}
+        return rooms
+
+    def _parse_total_count(self, data: Dict[str, Any]) -> Optional[int]:
+        """Parse the total number of hotels from meta, e.g. {"meta": [{"title": "1,234 properties"}]} -> 1234"""
+        meta = data.get("meta") or []
+        title = meta[0].get("title", "") if meta and isinstance(meta[0], dict) else ""
+        digits = re.sub(r"\D", "", title.split(" ")[0]) if title else ""
+        return int(digits) if digits else None
 
     def _format_duration(self, seconds: int) -> str:
         """Convert seconds to hours and minutes format"""
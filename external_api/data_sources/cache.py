@@ -0,0 +1,314 @@
+"""
+数据源响应缓存
+
+内存 LRU + TTL 缓存，可选 sqlite 持久化层。数据源方法通过 cached 装饰器按方法配置 TTL，
+只缓存 success 为 True 的结果；同时合并并发中的相同调用，只向上游发出一次请求。
+"""
+
+import asyncio
+import contextlib
+import copy
+import functools
+import inspect
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger("data_sources_cache")
+
+# 设置为 1 时关闭缓存
+CACHE_DISABLED_ENV_NAME = "DATA_SOURCE_CACHE_DISABLED"
+# 内存缓存最大条目数
+CACHE_MAX_ENTRIES_ENV_NAME = "DATA_SOURCE_CACHE_MAX_ENTRIES"
+# 内存缓存最大总字节数（按序列化后的大小计算）
+CACHE_MAX_BYTES_ENV_NAME = "DATA_SOURCE_CACHE_MAX_BYTES"
+# 单条结果最大字节数，超过时不缓存
+CACHE_MAX_ENTRY_BYTES_ENV_NAME = "DATA_SOURCE_CACHE_MAX_ENTRY_BYTES"
+# sqlite 持久化文件路径，不设置则只使用内存缓存
+CACHE_DB_PATH_ENV_NAME = "DATA_SOURCE_CACHE_DB_PATH"
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRY_BYTES = 16 * 1024 * 1024
+
+
+class ResponseCache:
+    """
+    数据源响应缓存
+
+    内存层为带 TTL 的 LRU，按条目数和总字节数淘汰，配置 db_path 时增加 sqlite 持久化层，内存未命中时回查 sqlite。
+    值写入时序列化一次，每次命中反序列化出新对象，调用方修改返回值不会影响缓存内容。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        db_path: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES,
+    ):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._max_entry_bytes = max_entry_bytes
+        self._db_path = db_path
+        # key -> (过期时间, 序列化后的值)
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        # namespace -> {"hits": int, "misses": int}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+        if self._db_path:
+            self._init_db()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        读取缓存，未命中或已过期时返回 None
+        """
+        data = self._get_memory(key)
+        if data is None and self._db_path:
+            try:
+                data, expires_at = await asyncio.to_thread(self._get_db, key)
+            except sqlite3.Error as e:
+                logger.warning(f"读取缓存数据库失败: {str(e)}")
+                data = None
+            if data is not None:
+                self._set_memory(key, data, expires_at)
+        if data is None:
+            return None
+        return pickle.loads(data)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        """
+        写入缓存，ttl 单位为秒；无法序列化或超过单条大小上限的结果不缓存
+        """
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning(f"缓存结果无法序列化: {str(e)}")
+            return
+        if len(data) > self._max_entry_bytes:
+            logger.info(f"结果大小 {len(data)} 字节超过单条缓存上限 {self._max_entry_bytes}，不缓存")
+            return
+
+        expires_at = time.time() + ttl
+        self._set_memory(key, data, expires_at)
+        if self._db_path:
+            try:
+                await asyncio.to_thread(self._set_db, key, data, expires_at)
+            except sqlite3.Error as e:
+                logger.warning(f"写入缓存数据库失败: {str(e)}")
+
+    def record(self, namespace: str, hit: bool):
+        """
+        记录一次命中或未命中
+        """
+        with self._lock:
+            stats = self._stats.setdefault(namespace, {"hits": 0, "misses": 0})
+            stats["hits" if hit else "misses"] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        获取各方法的命中统计
+
+        Returns:
+            Dict[str, Dict[str, int]]: namespace -> {"hits": 命中次数, "misses": 未命中次数}
+        """
+        with self._lock:
+            return {namespace: dict(stats) for namespace, stats in self._stats.items()}
+
+    def clear(self):
+        """
+        清空内存缓存和统计数据
+        """
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self._stats.clear()
+
+    def _get_memory(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self._total_bytes -= len(data)
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def _set_memory(self, key: str, data: bytes, expires_at: float):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= len(old[1])
+            self._entries[key] = (expires_at, data)
+            self._total_bytes += len(data)
+            while len(self._entries) > self._max_entries or self._total_bytes > self._max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted)
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._db_path, timeout=10)
+        try:
+            with conn:  # 自动提交或回滚
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS response_cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)")
+
+    def _get_db(self, key: str) -> Tuple[Optional[bytes], float]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, expires_at FROM response_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None, 0
+            # 旧版本以 JSON 文本保存的条目视为未命中，重新请求后覆盖
+            if row[1] <= time.time() or not isinstance(row[0], bytes):
+                conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                return None, 0
+            return row[0], row[1]
+
+    def _set_db(self, key: str, data: bytes, expires_at: float):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO response_cache (key, value, expires_at) VALUES (?, ?, ?)", (key, data, expires_at))
+
+
+class SingleFlight:
+    """
+    合并并发中的相同调用
+
+    同一事件循环中 key 相同的调用在第一个调用完成前只执行一次，发起调用的一方得到原始结果，其余等待者各自得到一份深拷贝。
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        执行调用，key 相同的调用正在进行时直接等待其结果
+
+        Args:
+            key: str - 调用标识
+            func: Callable[[], Awaitable[Any]] - 实际执行的调用
+        """
+        loop = asyncio.get_running_loop()
+        call_key = (loop, key)
+        with self._lock:
+            task = self._calls.get(call_key)
+            leader = task is None
+            if leader:
+                task = loop.create_task(func())
+                self._calls[call_key] = task
+                task.add_done_callback(lambda done: self._forget(call_key, done))
+
+        # shield: 某个等待者被取消不会取消共享的调用
+        result = await asyncio.shield(task)
+        # 发起调用的一方直接使用结果，只有合并进来的等待者需要拷贝
+        return result if leader else copy.deepcopy(result)
+
+    def in_flight(self) -> int:
+        """
+        当前正在进行的调用数
+        """
+        with self._lock:
+            return len(self._calls)
+
+    def _forget(self, call_key: Tuple[asyncio.AbstractEventLoop, str], task: asyncio.Task):
+        with self._lock:
+            if self._calls.get(call_key) is task:
+                del self._calls[call_key]
+
+
+_single_flight = SingleFlight()
+
+# 全局默认缓存
+_default_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    获取默认的响应缓存，通过环境变量关闭缓存时返回 None
+
+    Returns:
+        Optional[ResponseCache]: 默认缓存实例
+    """
+    global _default_cache
+    if os.getenv(CACHE_DISABLED_ENV_NAME) == "1":
+        return None
+    if _default_cache is None:
+        with _cache_lock:
+            if _default_cache is None:  # Double-check
+                _default_cache = ResponseCache(
+                    max_entries=int(os.getenv(CACHE_MAX_ENTRIES_ENV_NAME) or DEFAULT_MAX_ENTRIES),
+                    db_path=os.getenv(CACHE_DB_PATH_ENV_NAME) or None,
+                    max_bytes=int(os.getenv(CACHE_MAX_BYTES_ENV_NAME) or DEFAULT_MAX_BYTES),
+                    max_entry_bytes=int(os.getenv(CACHE_MAX_ENTRY_BYTES_ENV_NAME) or DEFAULT_MAX_ENTRY_BYTES),
+                )
+    return _default_cache
+
+
+def _make_key(namespace: str, signature: inspect.Signature, instance: Any, args: tuple, kwargs: Dict[str, Any]) -> str:
+    bound = signature.bind(instance, *args, **kwargs)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    arguments.pop("self", None)
+    return json.dumps(
+        {"method": namespace, "proxy_url": getattr(instance, "proxy_url", ""), "arguments": arguments},
+        sort_keys=True,
+        default=str,
+    )
+
+
+def cached(ttl: float) -> Callable:
+    """
+    缓存数据源方法的成功结果，并合并并发中的相同调用
+
+    Args:
+        ttl: float - 缓存有效期，单位秒
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        namespace = func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            try:
+                key = _make_key(namespace, signature, self, args, kwargs)
+            except TypeError:
+                # 参数不匹配时直接调用，让原方法抛出对应的错误
+                return await func(self, *args, **kwargs)
+
+            cache = get_response_cache()
+            if cache is not None:
+                result = await cache.get(key)
+                if result is not None:
+                    cache.record(namespace, hit=True)
+                    return result
+                cache.record(namespace, hit=False)
+
+            async def call():
+                result = await func(self, *args, **kwargs)
+                if cache is not None and isinstance(result, dict) and result.get("success"):
+                    await cache.set(key, result, ttl)
+                return result
+
+            return await _single_flight.do(key, call)
+
+        return wrapper
+
+    return decorator
@@ -10,10 +10,11 @@ import pkgutil
 import threading
 from enum import Enum
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 from docstring_parser import parse
 
+from ..function_utils import close_shared_session
 from .base import EXCLUDE_METHODS, BaseAPI
 
 # 用于在shell中设置LLM_GATEWAY_BASE_URL环境变量
@@ -42,6 +43,25 @@ config = {
 }
 
 
+# 数据源清单: 模块名 -> source_name
+# 清单中的模块在首次访问对应数据源时才导入；未登记的 *_source / *_function 模块仍在初始化时加载
+DATA_SOURCE_MANIFEST = {
+    "booking_source": "booking",
+    "commodities_source": "commodities",
+    "metal_source": "metal",
+    "patents_source": "patent",
+    "pinterest_source": "pinterest",
+    "scholar_source": "scholar",
+    "tripadvisor_source": "tripadvisor",
+    "twitter_source": "twitter",
+    "yahoo_source": "yahoo_finance",
+}
+
+
+# 数据源描述缓存: (数据源类, 数据源名称) -> 描述文本
+_desc_cache: Dict[Tuple[type, str], str] = {}
+
+
 class ApiType(Enum):
     DATA_SOURCE = "data_source"
     FUNCTION = "function"
@@ -78,37 +98,83 @@ class ApiClient:
                 return
             self._sources: Dict[str, BaseAPI] = {}
             self._functions: Dict[str, BaseAPI] = {}
+            # 尚未导入的数据源: source_name -> 模块名
+            self._pending_sources: Dict[str, str] = {}
+            self._pending_functions: Dict[str, str] = {}
+            self._load_lock = threading.Lock()
             self._load_data_sources()
             self._initialized = True
 
     def _load_data_sources(self):
         """
-        动态加载所有可用的数据源
-        通过扫描data_sources目录下的所有模块来加载数据源
+        登记所有可用的数据源
+        通过扫描data_sources目录下的所有模块来发现数据源，清单中的模块延迟到首次访问时导入
         """
         current_dir = Path(__file__).parent
         for module_info in pkgutil.iter_modules([str(current_dir)]):
-            type_dict = self._sources
+            pending = self._pending_sources
             if module_info.name.endswith("_function"):
-                type_dict = self._functions
+                pending = self._pending_functions
             elif not module_info.name.endswith("_source"):
                 continue
 
-            try:
-                module = importlib.import_module(f".{module_info.name}", package="external_api.data_sources")
-                for item_name in dir(module):
-                    item = getattr(module, item_name)
-                    if (
-                        isinstance(item, type)
-                        and issubclass(item, BaseAPI)
-                        and item != BaseAPI
-                        and item.__name__ not in self._exclude_sources
-                    ):
-                        source = item(config)
-                        type_dict[source.source_name] = source
-            except Exception as e:
-                logger.error(f"加载数据源模块 {module_info.name} 失败: {str(e)}\n")
-                logger.exception(e)
+            source_name = DATA_SOURCE_MANIFEST.get(module_info.name)
+            if source_name is not None:
+                pending[source_name] = module_info.name
+            else:
+                self._load_module(module_info.name)
+
+    def _load_module(self, module_name: str):
+        """
+        导入数据源模块并实例化其中的数据源
+        """
+        type_dict = self._functions if module_name.endswith("_function") else self._sources
+        try:
+            module = importlib.import_module(f".{module_name}", package="external_api.data_sources")
+            for item_name in dir(module):
+                item = getattr(module, item_name)
+                if (
+                    isinstance(item, type)
+                    and issubclass(item, BaseAPI)
+                    and item != BaseAPI
+                    and item.__name__ not in self._exclude_sources
+                ):
+                    source = item(config)
+                    type_dict[source.source_name] = source
+        except Exception as e:
+            logger.error(f"加载数据源模块 {module_name} 失败: {str(e)}\n")
+            logger.exception(e)
+
+    def _get_api(self, api_type: ApiType, api_name: str) -> Optional[BaseAPI]:
+        """
+        获取数据源实例，首次访问时导入对应模块
+        """
+        if api_type == ApiType.DATA_SOURCE:
+            apis, pending = self._sources, self._pending_sources
+        else:
+            apis, pending = self._functions, self._pending_functions
+
+        api = apis.get(api_name)
+        if api is None:
+            # 其他线程可能正在导入该模块，加锁后重新检查；模块导入完成后才从 pending 中移除
+            with self._load_lock:
+                api = apis.get(api_name)
+                module_name = pending.get(api_name)
+                if api is None and module_name is not None:
+                    self._load_module(module_name)
+                    pending.pop(api_name, None)
+                    api = apis.get(api_name)
+                    if api is None:
+                        logger.warning(f"数据源模块 {module_name} 中没有找到 {api_name}，请检查 DATA_SOURCE_MANIFEST")
+        return api
+
+    def _load_all(self, api_type: ApiType):
+        """
+        导入所有尚未加载的数据源
+        """
+        pending = self._pending_sources if api_type == ApiType.DATA_SOURCE else self._pending_functions
+        for api_name in list(pending):
+            self._get_api(api_type, api_name)
 
     def get_function_desc(self, function_name: str) -> str:
         """
@@ -145,17 +211,33 @@ class ApiClient:
         Returns:
             str: Readable description of the data source and its API
         """
-        output_lines = ["# Available data sources (refer to the python code examples, write python code to call them)\n"]
-
-        # Directly use the mapping value to get the data source instance
-        if api_type == ApiType.DATA_SOURCE:
-            api = self._sources.get(api_name)
-        else:
-            api = self._functions.get(api_name)
+        # Get the data source instance, importing its module on first use
+        api = self._get_api(api_type, api_name)
 
         if not api:
             return f"# {api_type.value} {api_name} does not exist"
 
+        # Descriptions only depend on the class, a reloaded module produces a new class and thus a new cache entry
+        cache_key = (api.__class__, api_name)
+        desc = _desc_cache.get(cache_key)
+        if desc is None:
+            desc = self._render_desc(api, api_name)
+            _desc_cache[cache_key] = desc
+        return desc
+
+    def _render_desc(self, api: BaseAPI, api_name: str) -> str:
+        """
+        Render the description of a data source from its api info and method docstrings
+
+        Args:
+            api: BaseAPI - data source instance
+            api_name: str - data source name
+
+        Returns:
+            str: Readable description of the data source and its API
+        """
+        output_lines = ["# Available data sources (refer to the python code examples, write python code to call them)\n"]
+
         api_info = api.get_api_info()
 
         # Add data source title and description
@@ -235,6 +317,7 @@ class ApiClient:
         """
         result = {}
 
+        self._load_all(ApiType.DATA_SOURCE)
         for name, source in self._sources.items():
             # yahoo_finance和twitter 已通过 tool 实现，这里不展示
             if name in ["yahoo_finance", "twitter", "booking", "pinterest", "tripadvisor"]:
@@ -256,10 +339,26 @@ class ApiClient:
         获取所有数据源的所有方法的描述
         """
         result = []
+        self._load_all(ApiType.FUNCTION)
         for function_name, function in self._functions.items():
             result.append(self.get_function_desc(function_name))
         return "\n".join(result)
 
+    async def aclose(self):
+        """
+        关闭已加载数据源持有的连接以及 function proxy 的共享 session，
+        长期运行的服务在事件循环结束前需要调用
+        """
+        for api in [*self._sources.values(), *self._functions.values()]:
+            aclose = getattr(api, "aclose", None)
+            if aclose is None:
+                continue
+            try:
+                await aclose()
+            except Exception as e:
+                logger.warning(f"关闭数据源 {api.source_name} 失败: {str(e)}")
+        await close_shared_session()
+
     def __getattr__(self, name: str) -> BaseAPI:
         """
         Get data source instance by attribute access
@@ -273,9 +372,13 @@ class ApiClient:
         Raises:
             AttributeError: data source does not exist
         """
-        if name not in self._sources:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        source = self._get_api(ApiType.DATA_SOURCE, name)
+        if source is None:
             raise AttributeError(f"Data source {name} does not exist")
-        return self._sources[name]
+        return source
 
 
 # 全局默认实例
@@ -10,6 +10,7 @@ from typing import Any, Dict, Optional
 import aiohttp
 
 from .base import BaseAPI
+from .cache import cached
 
 logger = logging.getLogger("commodities_source")
 
@@ -45,6 +46,7 @@ class CommoditiesSource(BaseAPI):
             "description": "Commodity price data source, provides price information for commodities such as COCOA, COFFEE, CORN, OIL, SOYBEAN, SUGAR, WHEAT, etc.",
         }
 
+    @cached(ttl=24 * 3600)
     async def get_supported_commodities(self) -> Dict[str, Any]:
         """Get the list of supported commodities.
         This method is used to get the list of commodities that can be queried.
@@ -119,6 +121,7 @@ class CommoditiesSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    @cached(ttl=60)
     async def get_commodities_price(
         self,
         commodity_code: str,
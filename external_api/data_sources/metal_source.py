@@ -11,6 +11,7 @@ from typing import Any, Dict, Optional
 import aiohttp
 
 from .base import BaseAPI
+from .cache import cached
 
 logger = logging.getLogger("metal_source")
 
@@ -46,6 +47,7 @@ class MetalSource(BaseAPI):
             "description": "Metal price data source, provides price information for metals such as Gold, Silver, Platinum, Palladium, Rhodium.",
         }
 
+    @cached(ttl=30)
     async def get_metal_price(
         self,
         currency_code: str,
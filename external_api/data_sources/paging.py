@@ -0,0 +1,66 @@
+"""
+游标分页工具
+
+按游标逐页请求搜索结果并逐条产出，供各数据源的 iter_* 方法复用。
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+async def iter_cursor_items(
+    fetch_page: Callable[[Optional[str]], Awaitable[Dict[str, Any]]],
+    items_key: str,
+    get_id: Callable[[Any], Hashable],
+    max_items: int,
+    error_message: str,
+    filter_page: Optional[Callable[[List[Any]], Tuple[List[Any], bool]]] = None,
+) -> AsyncIterator[Any]:
+    """
+    逐条产出游标分页的结果，消费当前页时预取下一页，按 id 去重（包括同一页内的重复项）
+
+    Args:
+        fetch_page: Callable[[Optional[str]], Awaitable[Dict[str, Any]]] - 按游标请求一页，返回 {"success", "data"/"error"}，
+            data 中包含 items_key 对应的结果列表和下一页的 "cursor"
+        items_key: str - data 中结果列表的键名
+        get_id: Callable[[Any], Hashable] - 获取单条结果的 id
+        max_items: int - 最多产出的条数
+        error_message: str - 请求失败时 RuntimeError 的错误信息前缀
+        filter_page: Optional[Callable[[List[Any]], Tuple[List[Any], bool]]] - 对去重后的一页结果进一步过滤，
+            返回 (保留的结果, 是否停止翻页)
+
+    Returns:
+        AsyncIterator[Any]: 去重后的结果，请求失败时抛出 RuntimeError
+    """
+    seen_ids = set()
+    yielded = 0
+    next_page = asyncio.ensure_future(fetch_page(None))
+    try:
+        while next_page is not None and yielded < max_items:
+            result = await next_page
+            next_page = None
+            if not result["success"]:
+                raise RuntimeError(f"{error_message}: {result['error']}")
+
+            page = result["data"]
+            items = []
+            for item in page[items_key]:
+                item_id = get_id(item)
+                if item_id not in seen_ids:
+                    seen_ids.add(item_id)
+                    items.append(item)
+            stop = False
+            if filter_page is not None:
+                items, stop = filter_page(items)
+
+            # 当前页没有新结果时游标不再前进，停止翻页
+            if page["cursor"] and items and not stop and yielded + len(items) < max_items:
+                next_page = asyncio.ensure_future(fetch_page(page["cursor"]))
+
+            for item in items[: max_items - yielded]:
+                yielded += 1
+                yield item
+    finally:
+        # 调用方提前结束迭代时取消预取的下一页
+        if next_page is not None:
+            next_page.cancel()
@@ -10,6 +10,7 @@ from typing import Any, Dict, Optional
 import aiohttp
 
 from .base import BaseAPI
+from .cache import cached
 
 logger = logging.getLogger("patents_source")
 
@@ -107,6 +108,7 @@ class PatentSource(BaseAPI):
             logger.error(f"_fetch_patents_page error: page={page}, error={e}")
             return {"success": False, "error": str(e)}
 
+    @cached(ttl=3 * 24 * 3600)
     async def search_patents(
         self,
         query: str,
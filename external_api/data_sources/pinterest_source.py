@@ -3,17 +3,28 @@ Pinterest data source implementation
 """
 
 import asyncio
+import hashlib
 import json
 import logging
+import os
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Union
+from urllib.parse import urlparse
 
 import aiohttp
 
 from .base import BaseAPI
+from .cache import cached
+from .paging import iter_cursor_items
 
 logger = logging.getLogger("pinterest_source")
 
+# 下载图片时每次写入磁盘的块大小
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# 缩略图按顺序取 images 中第一个存在的尺寸
+THUMBNAIL_SIZES = ("236x", "474x", "170x", "736x")
+
 
 class PinterestSource(BaseAPI):
     """Pinterest data source"""
@@ -38,6 +49,7 @@ class PinterestSource(BaseAPI):
         """Get data source information"""
         return {"name": self.source_name, "description": "Pinterest data source, provides user and pin search features for Pinterest."}
 
+    @cached(ttl=3600)
     async def search_pins(
         self, keyword: str, num: int = 10, nextPageCursor: Optional[str] = None, sort: str = "relevance"
     ) -> Dict[str, Any]:
@@ -66,7 +78,8 @@ class PinterestSource(BaseAPI):
                         "alt_text": "cat", # Image alt text
                         "auto_alt_text": "cat", # Image auto alt text
                         "images": { # Image info
-                            "url": "https://xxx.jpg" # Image url
+                            "url": "https://xxx.jpg", # Original image url
+                            "thumbnail_url": "https://xxx.jpg" # Thumbnail url (about 236px wide), original url if no thumbnail
                         },
                         "videos": { # Video info
                             "has_video": Whether has video
@@ -152,6 +165,180 @@ class PinterestSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    async def iter_pins(
+        self, keyword: str, max_pins: int = 200, page_size: int = 50, sort: str = "relevance"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over search results pin by pin, following pagination cursors automatically.
+        The next page is requested while the current page is consumed, duplicate pins are skipped.
+
+        Args:
+            keyword(str): Search keyword, e.g. "cats"
+            max_pins(int): Stop after yielding this many pins, default 200
+            page_size(int): Number of results requested per page, default 50
+            sort(str): Sort order, default "relevance", options: "relevance" or "recent"
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: Pins in the same format as the items of search_pins "pins",
+            raises RuntimeError when a page request fails, e.g.
+            async for pin in client.pinterest.iter_pins("cat", max_pins=300):
+                print(pin["id"], pin["images"]["url"])
+        """
+
+        def fetch_page(cursor: Optional[str]) -> Awaitable[Dict[str, Any]]:
+            return self.search_pins(keyword, num=page_size, nextPageCursor=cursor, sort=sort)
+
+        async for pin in iter_cursor_items(fetch_page, "pins", lambda pin: pin["id"], max_pins, "Failed to search pins"):
+            yield pin
+
+    async def search_all_pins(self, keyword: str, max_pins: int = 200, page_size: int = 50, sort: str = "relevance") -> Dict[str, Any]:
+        """
+        Search related pins across multiple pages, following pagination cursors automatically and removing duplicates.
+
+        Args:
+            keyword(str): Search keyword, e.g. "cats"
+            max_pins(int): Maximum number of pins to return, default 200
+            page_size(int): Number of results requested per page, default 50
+            sort(str): Sort order, default "relevance", options: "relevance" or "recent"
+
+        Returns:
+            Dict[str, Any]: Same format as search_pins without "cursor", e.g.
+            {
+                "success": True,
+                "data": {
+                    "keyword": "cat",
+                    "count": 200,
+                    "pins": [...]
+                }
+            }
+        """
+        pins = []
+        try:
+            async for pin in self.iter_pins(keyword, max_pins=max_pins, page_size=page_size, sort=sort):
+                pins.append(pin)
+        except RuntimeError as e:
+            # 已经取到的结果仍然返回
+            if not pins:
+                return {"success": False, "error": str(e)}
+            logger.warning(f"Stopped pin pagination after {len(pins)} pins: {str(e)}")
+        except Exception as e:
+            error_msg = f"Error occurred while searching pins: {str(e)}"
+            logger.error(error_msg)
+            logger.exception(e)
+            return {"success": False, "error": error_msg}
+
+        return {"success": True, "data": {"keyword": keyword, "count": len(pins), "pins": pins}}
+
+    async def download_pin_images(
+        self,
+        pins: List[Union[Dict[str, Any], str]],
+        output_dir: str,
+        max_concurrency: int = 8,
+        overwrite: bool = False,
+        size: str = "thumbnail",
+    ) -> Dict[str, Any]:
+        """
+        Download pin thumbnails (or original images) to a local directory concurrently, images are streamed to disk
+        without being held in memory.
+
+        Args:
+            pins(List[Union[Dict[str, Any], str]]): Pins returned by search_pins / search_all_pins, or image urls
+            output_dir(str): Directory to save images to, created if it does not exist
+            max_concurrency(int): Maximum number of images downloaded at the same time, default 8
+            overwrite(bool): Download again when the file already exists, default False
+            size(str): Image size to download, default "thumbnail", options: "thumbnail" (images.thumbnail_url) or
+                "original" (images.url), ignored for url strings
+
+        Returns:
+            Dict[str, Any]: Dictionary containing downloaded files, e.g.
+            {
+                "success": True,
+                "data": {
+                    "count": 1,
+                    "files": [
+                        {"id": "5559199536733192", "url": "https://xxx.jpg", "path": "images/5559199536733192.jpg"}
+                    ],
+                    "failed": [
+                        {"id": "123", "url": "https://yyy.jpg", "error": "HTTP request error: 404, ..."}
+                    ]
+                }
+            }
+        """
+        if size not in ("thumbnail", "original"):
+            return {"success": False, "error": f"Invalid size: {size}, options: thumbnail, original"}
+
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+
+            # 统一为 (id, url)，按 url 去重
+            targets: Dict[str, str] = {}
+            for pin in pins:
+                if isinstance(pin, str):
+                    url, pin_id = pin, ""
+                else:
+                    images = pin.get("images", {})
+                    url = images.get("url", "") if size == "original" else images.get("thumbnail_url") or images.get("url", "")
+                    pin_id = str(pin.get("id", ""))
+                if url and url not in targets:
+                    targets[url] = pin_id or hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+            timeout = aiohttp.ClientTimeout(total=self._timeout)
+
+            async with aiohttp.ClientSession(trust_env=True, timeout=timeout) as session:
+
+                async def download(url: str, pin_id: str) -> Dict[str, Any]:
+                    extension = os.path.splitext(urlparse(url).path)[1] or ".jpg"
+                    path = os.path.join(output_dir, f"{pin_id}{extension}")
+                    if not overwrite and os.path.exists(path):
+                        return {"id": pin_id, "url": url, "path": path}
+
+                    async with semaphore:
+                        temp_path = f"{path}.part"
+                        try:
+                            async with session.get(url) as response:
+                                response.raise_for_status()
+                                with open(temp_path, "wb") as file:
+                                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                                        file.write(chunk)
+                            os.replace(temp_path, path)
+                        except BaseException:
+                            if os.path.exists(temp_path):
+                                os.remove(temp_path)
+                            raise
+                    return {"id": pin_id, "url": url, "path": path}
+
+                results = await asyncio.gather(*(download(url, pin_id) for url, pin_id in targets.items()), return_exceptions=True)
+
+            files = []
+            failed = []
+            for (url, pin_id), result in zip(targets.items(), results):
+                if isinstance(result, asyncio.TimeoutError):
+                    failed.append({"id": pin_id, "url": url, "error": f"Request timeout (timeout={self._timeout}s)"})
+                elif isinstance(result, aiohttp.ClientError):
+                    failed.append({"id": pin_id, "url": url, "error": f"HTTP request error: {str(result)}"})
+                elif isinstance(result, Exception):
+                    failed.append({"id": pin_id, "url": url, "error": str(result)})
+                else:
+                    files.append(result)
+
+            # If all images fail to download
+            if targets and len(failed) == len(targets):
+                error_msg = "All pin image downloads failed:\n" + "\n".join([f"{item['url']}: {item['error']}" for item in failed])
+                return {"success": False, "error": error_msg}
+
+            if failed:
+                logger.warning(f"Failed to download {len(failed)} of {len(targets)} pin images")
+
+            return {"success": True, "data": {"count": len(files), "files": files, "failed": failed}}
+
+        except Exception as e:
+            error_msg = f"Error occurred while downloading pin images: {str(e)}"
+            logger.error(error_msg)
+            logger.exception(e)
+            return {"success": False, "error": error_msg}
+
+    @cached(ttl=3600)
     async def get_user_info(self, username: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Get detailed information of a Pinterest user.
@@ -238,9 +425,6 @@ class PinterestSource(BaseAPI):
             return date_str
 
     def _parse_pins(self, data: dict[str, Any]) -> list[dict[str, Any]]:
-        print(f"xwy-pins, {data}")
-        print("-" * 100)
-        print("\n")
         pins = []
         for pin_data in data.get("data", []):
             if not isinstance(pin_data, dict):
@@ -273,13 +457,19 @@ class PinterestSource(BaseAPI):
             if len(image_url) <= 0:
                 image_url = pin_data.get("images", {}).get("orig", {}).get("url", "")
 
+            thumbnail_url = ""
+            for size in THUMBNAIL_SIZES:
+                thumbnail_url = (pin_data.get("images", {}).get(size) or {}).get("url", "")
+                if thumbnail_url:
+                    break
+
             pin = {
                 "id": pin_data.get("id", ""),
                 "title": pin_data.get("title", ""),
                 "description": pin_data.get("description", ""),
                 "alt_text": pin_data.get("alt_text", ""),
                 "auto_alt_text": pin_data.get("auto_alt_text", ""),
-                "images": {"url": image_url},
+                "images": {"url": image_url, "thumbnail_url": thumbnail_url or image_url},
                 "videos": video,
                 "created_at": "2024-03-21 08:29:49",  # 创建时间
                 "likes": pin_data.get("reaction_counts", {}).get("1", 0),
@@ -296,9 +486,6 @@ class PinterestSource(BaseAPI):
 
     def _parse_user_info(self, resp: dict[str, Any]) -> dict[str, Any]:
         data = resp.get("data", [])
-        print(f"xwy-user, {data}")
-        print("-" * 100)
-        print("\n")
         if len(data) <= 0:
             return {}
 
@@ -0,0 +1,171 @@
+"""
+本地行情存储
+
+按 symbol + interval 把 K 线保存到 sqlite，并记录已覆盖的时间区间。再次查询时只需要向上游请求
+未覆盖的部分，其余直接从本地读取。通过环境变量配置文件路径后启用。
+"""
+
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("data_sources_price_store")
+
+# sqlite 文件路径，不设置则不使用本地行情存储
+PRICE_STORE_PATH_ENV_NAME = "DATA_SOURCE_PRICE_STORE_PATH"
+
+# 距当前时间不足该秒数的 K 线可能仍在变化，不计入已覆盖区间，下次查询时重新获取
+SETTLE_SECONDS = 24 * 3600
+
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class PriceStore:
+    """
+    本地行情存储
+
+    时间区间均为左闭右开 [start, end)，与图表接口的 period1 / period2 一致。
+    所有方法都是同步的，异步代码中通过 asyncio.to_thread 调用。
+    """
+
+    def __init__(self, db_path: str):
+        self._db_path = db_path
+        # 覆盖区间的读改写需要串行
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def missing_ranges(self, symbol: str, interval: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """
+        获取 [start, end) 中尚未覆盖的区间
+
+        Returns:
+            List[Tuple[int, int]]: 按时间顺序排列的未覆盖区间
+        """
+        missing = []
+        cursor = start
+        for covered_start, covered_end in self._get_coverage(symbol, interval):
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            missing.append((cursor, end))
+        return missing
+
+    def save(self, symbol: str, interval: str, start: int, end: int, timestamps: Sequence[int], quote: Dict[str, Sequence[Any]]):
+        """
+        保存 [start, end) 的 K 线，并把其中已稳定的部分记为已覆盖
+        """
+        rows = [
+            (symbol, interval, timestamp, *(quote[field][i] for field in PRICE_FIELDS))
+            for i, timestamp in enumerate(timestamps)
+        ]
+        covered_end = min(end, int(time.time()) - SETTLE_SECONDS)
+
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO price_bars (symbol, interval, timestamp, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if covered_end <= start:
+                return
+
+            # 与相交或相邻的已覆盖区间合并
+            overlaps = conn.execute(
+                "SELECT start, end FROM price_coverage WHERE symbol = ? AND interval = ? AND start <= ? AND end >= ?",
+                (symbol, interval, covered_end, start),
+            ).fetchall()
+            merged_start = min([start] + [row[0] for row in overlaps])
+            merged_end = max([covered_end] + [row[1] for row in overlaps])
+            conn.execute(
+                "DELETE FROM price_coverage WHERE symbol = ? AND interval = ? AND start <= ? AND end >= ?",
+                (symbol, interval, covered_end, start),
+            )
+            conn.execute(
+                "INSERT INTO price_coverage (symbol, interval, start, end) VALUES (?, ?, ?, ?)",
+                (symbol, interval, merged_start, merged_end),
+            )
+
+    def load(self, symbol: str, interval: str, start: int, end: int) -> Tuple[List[int], Dict[str, List[Any]]]:
+        """
+        读取 [start, end) 的 K 线
+
+        Returns:
+            Tuple[List[int], Dict[str, List[Any]]]: 按时间排序的时间戳和对应的各字段数据
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT timestamp, open, high, low, close, volume FROM price_bars "
+                "WHERE symbol = ? AND interval = ? AND timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+                (symbol, interval, start, end),
+            ).fetchall()
+        timestamps = [row[0] for row in rows]
+        quote = {field: [row[j + 1] for row in rows] for j, field in enumerate(PRICE_FIELDS)}
+        return timestamps, quote
+
+    def _get_coverage(self, symbol: str, interval: str) -> List[Tuple[int, int]]:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT start, end FROM price_coverage WHERE symbol = ? AND interval = ? ORDER BY start",
+                (symbol, interval),
+            ).fetchall()
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._db_path, timeout=10)
+        try:
+            with conn:  # 自动提交或回滚
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS price_bars ("
+                "symbol TEXT NOT NULL, interval TEXT NOT NULL, timestamp INTEGER NOT NULL, "
+                "open REAL, high REAL, low REAL, close REAL, volume REAL, "
+                "PRIMARY KEY (symbol, interval, timestamp))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS price_coverage ("
+                "symbol TEXT NOT NULL, interval TEXT NOT NULL, start INTEGER NOT NULL, end INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS price_coverage_symbol ON price_coverage (symbol, interval, start)")
+
+
+# 全局默认存储
+_default_store: Optional[PriceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_price_store() -> Optional[PriceStore]:
+    """
+    获取默认的本地行情存储，未配置环境变量或初始化失败时返回 None
+
+    Returns:
+        Optional[PriceStore]: 默认存储实例
+    """
+    global _default_store
+    db_path = os.getenv(PRICE_STORE_PATH_ENV_NAME)
+    if not db_path:
+        return None
+    if _default_store is None:
+        with _store_lock:
+            if _default_store is None:  # Double-check
+                try:
+                    _default_store = PriceStore(db_path)
+                except sqlite3.Error as e:
+                    logger.warning(f"初始化本地行情存储失败: {str(e)}")
+                    return None
+    return _default_store
@@ -10,6 +10,7 @@ from typing import Any, Dict, Optional
 import aiohttp
 
 from .base import BaseAPI
+from .cache import cached
 
 logger = logging.getLogger("scholar_source")
 
@@ -111,6 +112,7 @@ class ScholarSource(BaseAPI):
             logger.error(f"_fetch_scholar_page error: page={page}, error={e}")
             return {"success": False, "error": str(e)}
 
+    @cached(ttl=3 * 24 * 3600)
     async def search_scholar(
         self,
         query: str,
@@ -2,16 +2,28 @@
 TripAdvisor Officical API data source implementation
 """
 
+import asyncio
+import importlib.util
 import logging
+import threading
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 
 from .base import BaseAPI
+from .cache import cached
 
 logger = logging.getLogger("tripadvisor_official_source")
 
+# 连接池配置
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 30
+
+# httpx 的 HTTP/2 支持依赖 h2 包（httpx[http2]），未安装时退回 HTTP/1.1
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
 
 class TripAdvisorSource(BaseAPI):
     """TripAdvisor official API data source"""
@@ -27,7 +39,42 @@ class TripAdvisorSource(BaseAPI):
             "X-Biz-Id":"matrix-agent",
             "X-Request-Timeout": str(config["timeout"]-5),
         }
-
+        # 每个事件循环一个长连接客户端，AsyncClient 不能跨事件循环使用: id(loop) -> (loop, client)
+        # 保持中的连接强引用所属的 loop，不能用弱引用字典自动清理；已关闭的 loop 在下次获取客户端时移除
+        self._clients: Dict[int, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+        self._clients_lock = threading.Lock()
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """获取当前事件循环的 AsyncClient，复用连接并在可用时启用 HTTP/2"""
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            # 结束前没有调用 aclose 的 loop 已无法再关闭客户端，这里只移除引用
+            for loop_id, (client_loop, _) in list(self._clients.items()):
+                if client_loop.is_closed():
+                    del self._clients[loop_id]
+
+            entry = self._clients.get(id(loop))
+            client = entry[1] if entry is not None else None
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    http2=HTTP2_ENABLED,
+                    timeout=httpx.Timeout(self.timeout),
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=KEEPALIVE_EXPIRY,
+                    ),
+                )
+                self._clients[id(loop)] = (loop, client)
+            return client
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环的 AsyncClient，事件循环结束前调用"""
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            entry = self._clients.pop(id(loop), None)
+        if entry is not None and not entry[1].is_closed:
+            await entry[1].aclose()
 
     async def _make_api_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a request to the Tripadvisor Content API"""
@@ -36,10 +83,9 @@ class TripAdvisorSource(BaseAPI):
         if params is None:
             params = {}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        response = await self._get_http_client().get(url, headers=self.headers, params=params)
+        response.raise_for_status()
+        return response.json()
 
     @property
     def source_name(self) -> str:
@@ -52,6 +98,7 @@ class TripAdvisorSource(BaseAPI):
             "description": "TripAdvisor official API data source, provides location info, reviews, and image search from TripAdvisor.",
         }
 
+    @cached(ttl=3600)
     async def search_locations(
         self,
         searchQuery: str,
@@ -118,6 +165,7 @@ class TripAdvisorSource(BaseAPI):
             logger.error(f"Error searching locations: {e}")
             return {"success": False, "error": str(e)}
 
+    @cached(ttl=3600)
     async def search_nearby_locations(
         self,
         latitude: float,
@@ -177,6 +225,7 @@ class TripAdvisorSource(BaseAPI):
             logger.error(f"Error searching nearby locations: {e}")
             return {"success": False, "error": str(e)}
 
+    @cached(ttl=6 * 3600)
     async def get_location_details(
         self,
         locationId: int,
@@ -286,6 +335,7 @@ class TripAdvisorSource(BaseAPI):
             logger.error(f"Error getting location details: {e}")
             return {"success": False, "error": str(e)}
 
+    @cached(ttl=3600)
     async def get_location_reviews(
         self,
         locationId: int,
@@ -359,6 +409,7 @@ class TripAdvisorSource(BaseAPI):
             logger.error(f"Error getting location reviews: {e}")
             return {"success": False, "error": str(e)}
 
+    @cached(ttl=24 * 3600)
     async def get_location_photos(
         self,
         locationId: int,
@@ -412,6 +463,92 @@ class TripAdvisorSource(BaseAPI):
             logger.error(f"Error getting location photos: {e}")
             return {"success": False, "error": str(e)}
 
+    async def get_location_dossiers(
+        self,
+        searchQuery: str,
+        top_n: int = 5,
+        language: str = "en",
+        category: Optional[str] = None,
+        include_reviews: bool = True,
+        include_photos: bool = True,
+        max_concurrency: int = 8,
+    ) -> Dict[str, Any]:
+        """
+        Search for locations and get details, reviews and photos of the top results in one call, all requests are sent concurrently.
+
+        Args:
+            searchQuery(str): The text to search for
+            top_n(int): Number of top search results to fetch (default: 5)
+            language(str): Language code (default: 'en')
+            category(str): Optional category filter ('hotels', 'attractions', 'restaurants', 'geos')
+            include_reviews(bool): Whether to fetch reviews (default: True)
+            include_photos(bool): Whether to fetch photos (default: True)
+            max_concurrency(int): Maximum number of requests sent at the same time (default: 8)
+
+        Returns:
+            Dict[str, Any]: Dictionary containing one record per location in search order, "details", "reviews" and
+            "photos" have the same content as the "data" of get_location_details, get_location_reviews and
+            get_location_photos, a section that failed is None and listed in "failed_sections", e.g.
+            {
+                "success": True,               # Whether successful
+                "data": [                      # If successful, contains the following fields
+                    {
+                        "location_id": "13189438", # Location ID
+                        "name": "Hotel Xcaret Mexico", # Location name
+                        "address_obj": {...}, # Location address from search results
+                        "details": {...}, # Location details
+                        "reviews": [...], # Recent reviews
+                        "photos": [...], # Photos
+                        "failed_sections": [] # e.g. [{"section": "photos", "error": "..."}]
+                    },
+                    ...
+                ]
+            }
+        """
+        search_result = await self.search_locations(searchQuery=searchQuery, language=language, category=category)
+        if not search_result["success"]:
+            return search_result
+
+        try:
+            locations = search_result["data"][: max(0, top_n)]
+            sections = {"details": self.get_location_details}
+            if include_reviews:
+                sections["reviews"] = self.get_location_reviews
+            if include_photos:
+                sections["photos"] = self.get_location_photos
+
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def fetch_section(section: str, location_id: Any) -> Dict[str, Any]:
+                async with semaphore:
+                    return await sections[section](locationId=location_id, language=language)
+
+            # 所有地点的所有部分一起并发请求
+            calls = [(index, section) for index in range(len(locations)) for section in sections]
+            results = await asyncio.gather(
+                *(fetch_section(section, locations[index].get("location_id")) for index, section in calls),
+                return_exceptions=True,
+            )
+
+            dossiers = [{**location, "failed_sections": []} for location in locations]
+            for (index, section), result in zip(calls, results):
+                dossier = dossiers[index]
+                if isinstance(result, Exception):
+                    error = str(result)
+                elif result["success"]:
+                    dossier[section] = result["data"]
+                    continue
+                else:
+                    error = result["error"]
+                logger.warning(f"Error getting {section} of location {dossier.get('location_id')}: {error}")
+                dossier[section] = None
+                dossier["failed_sections"].append({"section": section, "error": error})
+
+            return {"success": True, "data": dossiers}
+        except Exception as e:
+            logger.error(f"Error getting location dossiers: {e}")
+            return {"success": False, "error": str(e)}
+
     def _parse_reviews(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Parse location review data"""
         reviews = []
@@ -588,6 +725,7 @@ async def main():
     # print(await client.tripadvisor.get_location_reviews(locationId=13189438, language="en"))
     # print("\n")
     # print(await client.tripadvisor.get_location_photos(locationId=13189438, language="en"))
+    await client.aclose()
 
 
 if __name__ == "__main__":
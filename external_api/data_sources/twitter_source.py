@@ -5,15 +5,274 @@ Twitter data source implementation
 import asyncio
 import json
 import logging
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple, Union
 
 import aiohttp
 
 from .base import BaseAPI
+from .cache import cached
+from .paging import iter_cursor_items
 
 logger = logging.getLogger("twitter_source")
 
+_MONTHS = {
+    "Jan": "01",
+    "Feb": "02",
+    "Mar": "03",
+    "Apr": "04",
+    "May": "05",
+    "Jun": "06",
+    "Jul": "07",
+    "Aug": "08",
+    "Sep": "09",
+    "Oct": "10",
+    "Nov": "11",
+    "Dec": "12",
+}
+
+
+def _format_twitter_date(date_str: Optional[str]) -> Optional[str]:
+    """Format "Thu Mar 13 18:08:35 +0000 2025" as "2025-03-13 18:08:35", keeping the original wall time"""
+    if not date_str:
+        return None
+    # 快速路径: 按空格切分直接重排，格式不符时回退到 strptime
+    parts = date_str.split(" ")
+    if len(parts) == 6:
+        _, month_name, day, clock, offset, year = parts
+        month = _MONTHS.get(month_name)
+        if month and len(day) == 2 and day.isdigit() and len(clock) == 8 and len(offset) == 5 and len(year) == 4 and year.isdigit():
+            return f"{year}-{month}-{day} {clock}"
+    try:
+        dt = datetime.strptime(date_str, "%a %b %d %H:%M:%S %z %Y")
+        return dt.strftime("%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return date_str
+
+
+@dataclass(slots=True)
+class TweetRecord:
+    """
+    Compact tweet record for high-volume collection
+
+    Nested author / public_metrics dicts are only built by to_dict(), created_at is formatted on access.
+    """
+
+    id: str
+    text: str
+    creation_date: Optional[str]
+    media_urls: List[str]
+    video_urls: List[str]
+    author_id: str
+    author_name: Optional[str]
+    author_username: Optional[str]
+    author_followers_count: int
+    author_is_verified: bool
+    author_is_blue_verified: bool
+    retweet_count: int
+    reply_count: int
+    like_count: int
+    quote_count: int
+    view_count: int
+    bookmark_count: int
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "TweetRecord":
+        """Parse one item of the search API results in a single pass"""
+        get = result.get
+        user = get("user") or {}
+        user_get = user.get
+        media_urls = get("media_urls")
+        video_urls = get("video_urls")
+        return cls(
+            id=str(get("tweet_id")),
+            text=get("text", ""),
+            creation_date=get("creation_date"),
+            media_urls=media_urls if isinstance(media_urls, list) else [],
+            video_urls=video_urls if isinstance(video_urls, list) else [],
+            author_id=str(user_get("user_id")),
+            author_name=user_get("name"),
+            author_username=user_get("username"),
+            author_followers_count=user_get("follower_count", 0),
+            author_is_verified=user_get("is_verified", False),
+            author_is_blue_verified=user_get("is_blue_verified", False),
+            retweet_count=get("retweet_count", 0),
+            reply_count=get("reply_count", 0),
+            like_count=get("favorite_count", 0),
+            quote_count=get("quote_count", 0),
+            view_count=get("views", 0),
+            bookmark_count=get("bookmark_count", 0),
+        )
+
+    @property
+    def created_at(self) -> Optional[str]:
+        return _format_twitter_date(self.creation_date)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the tweet dict returned by search_tweets"""
+        return {
+            "id": self.id,
+            "created_at": self.created_at,
+            "text": self.text,
+            "media_urls": self.media_urls,
+            "video_urls": self.video_urls,
+            "author": {
+                "id": self.author_id,
+                "name": self.author_name,
+                "username": self.author_username,
+                "followers_count": self.author_followers_count,
+                "is_verified": self.author_is_verified,
+                "is_blue_verified": self.author_is_blue_verified,
+            },
+            "public_metrics": {
+                "retweet_count": self.retweet_count,
+                "reply_count": self.reply_count,
+                "like_count": self.like_count,
+                "quote_count": self.quote_count,
+                "view_count": self.view_count,
+                "bookmark_count": self.bookmark_count,
+            },
+        }
+
+
+def _parse_user(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(data.get("user_id")),
+        "username": data.get("username"),
+        "name": data.get("name"),
+        "created_at": _format_twitter_date(data.get("creation_date")),
+        "description": data.get("description"),
+        "location": data.get("location"),
+        "url": data.get("external_url"),
+        "profile_image_url": data.get("profile_pic_url"),
+        "profile_banner_url": data.get("profile_banner_url"),
+        "public_metrics": {
+            "followers_count": data.get("follower_count", 0),
+            "following_count": data.get("following_count", 0),
+            "tweet_count": data.get("number_of_tweets", 0),
+            "listed_count": data.get("listed_count", 0),
+            "like_count": data.get("favourites_count", 0),
+        },
+        "verified": data.get("is_verified", False),
+        "blue_verified": data.get("is_blue_verified", False),
+        "private": data.get("is_private", False),
+        "bot": data.get("bot", False),
+    }
+
+
+def _as_url_list(value: Any) -> List[str]:
+    if not value:
+        return []
+    return list(value) if isinstance(value, list) else [value]
+
+
+@dataclass(slots=True)
+class UserTweetRecord:
+    """
+    Compact record for the items of get_user_tweets
+
+    The author is kept as the raw API dict and only parsed by to_dict(), created_at is formatted on access.
+    Referenced tweets are stored as nested records: ref_tweet is the retweeted or quoted tweet, and for a
+    retweet of a quote, ref_tweet.ref_tweet is the quoted tweet.
+    """
+
+    id: str
+    text: str
+    creation_date: Optional[str]
+    language: Optional[str]
+    media_urls: List[str]
+    video_urls: List[str]
+    retweet_count: int
+    reply_count: int
+    like_count: int
+    quote_count: int
+    view_count: int
+    bookmark_count: int
+    raw_user: Dict[str, Any]
+    # "reply" / "retweet" / "quote"，没有引用时为 None
+    ref_type: Optional[str] = None
+    # 回复的推文 ID，只有 ref_type 为 reply 时有值
+    ref_id: Optional[str] = None
+    ref_tweet: Optional["UserTweetRecord"] = None
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any], with_ref: bool = True) -> "UserTweetRecord":
+        """Parse one item of the user tweets API results in a single pass"""
+        get = result.get
+        record = cls(
+            id=str(get("tweet_id")),
+            text=get("text", ""),
+            creation_date=get("creation_date"),
+            language=get("language"),
+            media_urls=_as_url_list(get("media_url")),
+            video_urls=_as_url_list(get("video_url")),
+            retweet_count=get("retweet_count", 0),
+            reply_count=get("reply_count", 0),
+            like_count=get("favorite_count", 0),
+            quote_count=get("quote_count", 0),
+            view_count=get("views", 0),
+            bookmark_count=get("bookmark_count", 0),
+            raw_user=get("user", {}),
+        )
+        if not with_ref:
+            return record
+
+        retweet = get("retweet_status")
+        quoted = get("quoted_status")
+        if get("in_reply_to_status_id"):
+            record.ref_type = "reply"
+            record.ref_id = str(get("in_reply_to_status_id", ""))
+        elif get("retweet_tweet_id") and retweet:
+            record.ref_type = "retweet"
+            record.ref_tweet = cls.from_result(retweet, with_ref=False)
+            if retweet.get("quoted_status"):
+                record.ref_tweet.ref_type = "quote"
+                record.ref_tweet.ref_tweet = cls.from_result(retweet["quoted_status"], with_ref=False)
+        elif get("quoted_status_id") and quoted:
+            record.ref_type = "quote"
+            record.ref_tweet = cls.from_result(quoted, with_ref=False)
+        return record
+
+    @property
+    def created_at(self) -> Optional[str]:
+        return _format_twitter_date(self.creation_date)
+
+    @property
+    def user(self) -> Dict[str, Any]:
+        return _parse_user(self.raw_user)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the tweet dict returned by get_user_tweets"""
+        tweet = self._to_base_dict()
+        if self.ref_type == "reply":
+            tweet["referenced_tweets"] = {"type": "reply", "id": self.ref_id}
+        elif self.ref_tweet is not None:
+            referenced_tweets = {"type": self.ref_type, **self.ref_tweet._to_base_dict()}
+            if self.ref_type == "retweet" and self.ref_tweet.ref_tweet is not None:
+                referenced_tweets["quoted_status"] = {"type": "quote", **self.ref_tweet.ref_tweet._to_base_dict()}
+            tweet["referenced_tweets"] = referenced_tweets
+        return tweet
+
+    def _to_base_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "created_at": self.created_at,
+            "text": self.text,
+            "language": self.language,
+            "media_urls": self.media_urls,
+            "video_urls": self.video_urls,
+            "public_metrics": {
+                "retweet_count": self.retweet_count,
+                "reply_count": self.reply_count,
+                "like_count": self.like_count,
+                "quote_count": self.quote_count,
+                "view_count": self.view_count,
+                "bookmark_count": self.bookmark_count,
+            },
+            "user": self.user,
+        }
+
 
 class TwitterSource(BaseAPI):
     """Twitter data source"""
@@ -41,6 +300,7 @@ class TwitterSource(BaseAPI):
             "description": "Twitter data source, providing tweet search, user info retrieval, and user tweet list retrieval",
         }
 
+    @cached(ttl=300)
     async def search_tweets(
         self,
         query: str,
@@ -52,6 +312,8 @@ class TwitterSource(BaseAPI):
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         cursor: Optional[str] = None,
+        compact: bool = False,
+        section: str = "top",
     ) -> Dict[str, Any]:
         """
         Search for tweets.
@@ -66,6 +328,9 @@ class TwitterSource(BaseAPI):
             start_date (Optional[str]): Start date, format: YYYY-MM-DD, default is None
             end_date (Optional[str]): End date, format: YYYY-MM-DD, default is None
             cursor (Optional[str]): Pagination cursor, used to get next page results, default is None for first page
+            compact (bool): Return TweetRecord objects instead of dicts in "tweets", use record.to_dict() to get the
+                dict below, recommended for high-volume collection, default is False
+            section (str): Result ordering, default is "top" (by relevance), options: "top" or "latest" (newest first)
 
         Returns:
             Dict[str, Any]: Dictionary containing tweet search results, e.g.
@@ -127,7 +392,7 @@ class TwitterSource(BaseAPI):
             # 构建查询参数
             params = {
                 "query": query,
-                "section": "top",
+                "section": section,
                 "limit": min(limit, 100),  # API限制最大100条
             }
 
@@ -170,30 +435,8 @@ class TwitterSource(BaseAPI):
                     logger.warning(f"Skipping invalid tweet data: {result}")
                     continue
 
-                tweet = {
-                    "id": str(result.get("tweet_id")),
-                    "created_at": self._format_date(result.get("creation_date")),
-                    "text": result.get("text", ""),
-                    "media_urls": result.get("media_urls", []) if isinstance(result.get("media_urls"), list) else [],
-                    "video_urls": result.get("video_urls", []) if isinstance(result.get("video_urls"), list) else [],
-                    "author": {
-                        "id": str(result.get("user", {}).get("user_id")),
-                        "name": result.get("user", {}).get("name"),
-                        "username": result.get("user", {}).get("username"),
-                        "followers_count": result.get("user", {}).get("follower_count", 0),
-                        "is_verified": result.get("user", {}).get("is_verified", False),
-                        "is_blue_verified": result.get("user", {}).get("is_blue_verified", False),
-                    },
-                    "public_metrics": {
-                        "retweet_count": result.get("retweet_count", 0),
-                        "reply_count": result.get("reply_count", 0),
-                        "like_count": result.get("favorite_count", 0),
-                        "quote_count": result.get("quote_count", 0),
-                        "view_count": result.get("views", 0),
-                        "bookmark_count": result.get("bookmark_count", 0),
-                    },
-                }
-                tweets.append(tweet)
+                record = TweetRecord.from_result(result)
+                tweets.append(record if compact else record.to_dict())
 
             return {
                 "success": True,
@@ -214,6 +457,75 @@ class TwitterSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    async def iter_tweets(
+        self,
+        query: str,
+        max_tweets: int = 1000,
+        page_size: int = 100,
+        lang: Optional[str] = None,
+        min_retweets: Optional[int] = None,
+        min_likes: Optional[int] = None,
+        min_replies: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        stop_date: Optional[str] = None,
+        compact: bool = False,
+    ) -> AsyncIterator[Union[Dict[str, Any], TweetRecord]]:
+        """
+        Iterate over search results tweet by tweet, following pagination cursors automatically.
+        The next page is requested while the current page is consumed, duplicate tweets are skipped.
+
+        Args:
+            query (str): Search keyword, e.g. "Tesla" or "#TSLA"
+            max_tweets (int): Stop after yielding this many tweets, default is 1000
+            page_size (int): Number of tweets requested per page, at most 100, default is 100
+            lang (Optional[str]): Language code, zh for Chinese, en for English, default is None
+            min_retweets (Optional[int]): Minimum number of retweets, default is None
+            min_likes (Optional[int]): Minimum number of likes, default is None
+            min_replies (Optional[int]): Minimum number of replies, default is None
+            start_date (Optional[str]): Start date, format: YYYY-MM-DD, default is None
+            end_date (Optional[str]): End date, format: YYYY-MM-DD, default is None
+            stop_date (Optional[str]): Format: YYYY-MM-DD, results are requested newest first, tweets created before
+                this date are skipped and iteration stops at the first page whose tweets are all older, default is None
+            compact (bool): Yield TweetRecord objects instead of dicts, default is False
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: Tweets in the same format as the items of search_tweets "tweets",
+            raises RuntimeError when a page request fails, e.g.
+            async for tweet in client.twitter.iter_tweets("Tesla", max_tweets=500):
+                print(tweet["id"], tweet["text"])
+        """
+        page_size = max(1, min(page_size, 100))
+
+        def fetch_page(cursor: Optional[str]) -> Awaitable[Dict[str, Any]]:
+            return self.search_tweets(
+                query,
+                limit=page_size,
+                lang=lang,
+                min_retweets=min_retweets,
+                min_likes=min_likes,
+                min_replies=min_replies,
+                start_date=start_date,
+                end_date=end_date,
+                cursor=cursor,
+                compact=True,
+                # 按时间倒序返回时，整页早于 stop_date 才意味着之后的页也都更早
+                section="latest" if stop_date else "top",
+            )
+
+        def filter_page(tweets: List[TweetRecord]) -> Tuple[List[TweetRecord], bool]:
+            if not stop_date:
+                return tweets, False
+            in_range = [tweet for tweet in tweets if not tweet.created_at or tweet.created_at[:10] >= stop_date]
+            # 整页都早于 stop_date 时停止翻页
+            return in_range, bool(tweets) and not in_range
+
+        async for tweet in iter_cursor_items(
+            fetch_page, "tweets", lambda tweet: tweet.id, max_tweets, "Failed to search tweets", filter_page
+        ):
+            yield tweet if compact else tweet.to_dict()
+
+    @cached(ttl=3600)
     async def get_user_info(self, username: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Get detailed information about a Twitter user.
@@ -303,8 +615,75 @@ class TwitterSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    async def get_users_info(self, usernames: List[str], max_concurrency: int = 8) -> Dict[str, Any]:
+        """
+        Get information about multiple Twitter users, requests are sent concurrently and repeated usernames
+        (case-insensitive, with or without @) are only requested once.
+
+        Args:
+            usernames (List[str]): Twitter username list
+            max_concurrency (int): Maximum number of users requested at the same time, default is 8
+
+        Returns:
+            Dict[str, Any]: Dictionary containing user information, each user has the same content as the "data" of
+            get_user_info, users keep the order of first appearance, e.g.
+            {
+                "success": True,
+                "data": {
+                    "count": 1,
+                    "users": [
+                        {"id": "44196397", "username": "elonmusk", "name": "Elon Musk", ...}
+                    ],
+                    "failed_usernames": [
+                        {"username": "not_exist_user", "error": "HTTP request error: ..."}
+                    ]
+                }
+            }
+        """
+        try:
+            # 用户名不区分大小写，统一后去重，缓存也按统一后的用户名命中
+            unique_usernames = list(dict.fromkeys(username.strip().lstrip("@").lower() for username in usernames))
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def fetch_user_info(username: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self.get_user_info(username)
+
+            results = await asyncio.gather(*(fetch_user_info(username) for username in unique_usernames), return_exceptions=True)
+
+            users = []
+            failed_usernames = []
+            for username, result in zip(unique_usernames, results):
+                if isinstance(result, Exception):
+                    failed_usernames.append({"username": username, "error": str(result)})
+                    logger.error(f"Error occurred while getting user info of {username}: {str(result)}")
+                elif result["success"]:
+                    users.append(result["data"])
+                else:
+                    failed_usernames.append({"username": username, "error": result["error"]})
+
+            # If all users fail to get data
+            if unique_usernames and len(failed_usernames) == len(unique_usernames):
+                error_msg = "All user info retrieval failed:\n" + "\n".join([f"{failed['username']}: {failed['error']}" for failed in failed_usernames])
+                return {"success": False, "error": error_msg}
+
+            return {"success": True, "data": {"count": len(users), "users": users, "failed_usernames": failed_usernames}}
+
+        except Exception as e:
+            error_msg = f"Error occurred while getting users info: {str(e)}"
+            logger.error(error_msg)
+            logger.exception(e)
+            return {"success": False, "error": error_msg}
+
+    @cached(ttl=300)
     async def get_user_tweets(
-        self, username: str, limit: int = 10, user_id: Optional[str] = None, include_replies: bool = False, include_pinned: bool = False
+        self,
+        username: str,
+        limit: int = 10,
+        user_id: Optional[str] = None,
+        include_replies: bool = False,
+        include_pinned: bool = False,
+        compact: bool = False,
     ) -> Dict[str, Any]:
         """
         Get a list of tweets from a Twitter user.
@@ -315,6 +694,8 @@ class TwitterSource(BaseAPI):
             user_id (Optional[str]): Twitter user ID, default is None, if provided user_id, username will be ignored
             include_replies (bool): Whether to include reply tweets, default is False
             include_pinned (bool): Whether to include pinned tweets, default is False
+            compact (bool): Return UserTweetRecord objects instead of dicts in "tweets", use record.to_dict() to get
+                the dict below, recommended for high-volume collection, default is False
 
         Returns:
             Dict[str, Any]: Dictionary containing user tweet list, e.g.
@@ -402,9 +783,8 @@ class TwitterSource(BaseAPI):
 
             tweets = []
             for result in data["results"]:
-                tweet = self._parse_tweet_with_ref(result)
-
-                tweets.append(tweet)
+                record = UserTweetRecord.from_result(result)
+                tweets.append(record if compact else record.to_dict())
 
             return {
                 "success": True,
@@ -427,95 +807,15 @@ class TwitterSource(BaseAPI):
 
     def _format_date(self, date_str: Optional[str]) -> Optional[str]:
         """Format date string"""
-        if not date_str:
-            return None
-        try:
-            # 新API的日期格式示例: "Thu Mar 13 18:08:35 +0000 2025"
-            dt = datetime.strptime(date_str, "%a %b %d %H:%M:%S %z %Y")
-            return dt.strftime("%Y-%m-%d %H:%M:%S")
-        except Exception:
-            return date_str
+        # 新API的日期格式示例: "Thu Mar 13 18:08:35 +0000 2025"
+        return _format_twitter_date(date_str)
 
     def _parse_user_info(self, data: dict[str, Any]) -> dict[str, Any]:
-        return {
-            "id": str(data.get("user_id")),
-            "username": data.get("username"),
-            "name": data.get("name"),
-            "created_at": self._format_date(data.get("creation_date")),
-            "description": data.get("description"),
-            "location": data.get("location"),
-            "url": data.get("external_url"),
-            "profile_image_url": data.get("profile_pic_url"),
-            "profile_banner_url": data.get("profile_banner_url"),
-            "public_metrics": {
-                "followers_count": data.get("follower_count", 0),
-                "following_count": data.get("following_count", 0),
-                "tweet_count": data.get("number_of_tweets", 0),
-                "listed_count": data.get("listed_count", 0),
-                "like_count": data.get("favourites_count", 0),
-            },
-            "verified": data.get("is_verified", False),
-            "blue_verified": data.get("is_blue_verified", False),
-            "private": data.get("is_private", False),
-            "bot": data.get("bot", False),
-        }
+        return _parse_user(data)
 
     def _parse_tweet_without_ref(self, result: dict[str, Any]) -> dict[str, Any]:
-        media_urls = []
-        if result.get("media_url"):
-            if isinstance(result["media_url"], list):
-                media_urls.extend(result["media_url"])
-            else:
-                media_urls.append(result["media_url"])
-
-        # 处理视频URL
-        video_urls = []
-        if result.get("video_url"):
-            if isinstance(result["video_url"], list):
-                video_urls.extend(result["video_url"])
-            elif result["video_url"]:
-                video_urls.append(result["video_url"])
-
-        tweet = {
-            "id": str(result.get("tweet_id")),
-            "created_at": self._format_date(result.get("creation_date")),
-            "text": result.get("text", ""),
-            "language": result.get("language"),
-            "media_urls": media_urls,
-            "video_urls": video_urls,
-            "public_metrics": {
-                "retweet_count": result.get("retweet_count", 0),
-                "reply_count": result.get("reply_count", 0),
-                "like_count": result.get("favorite_count", 0),
-                "quote_count": result.get("quote_count", 0),
-                "view_count": result.get("views", 0),
-                "bookmark_count": result.get("bookmark_count", 0),
-            },
-            "user": self._parse_user_info(result.get("user", {})),
-        }
-
-        return tweet
+        return UserTweetRecord.from_result(result, with_ref=False).to_dict()
 
     def _parse_tweet_with_ref(self, result: dict[str, Any]) -> dict[str, Any]:
         """Parse tweet data"""
-
-        tweet = self._parse_tweet_without_ref(result)
-
-        # 处理引用推文
-        referenced_tweets: dict[str, Any] = {}
-        if result.get("in_reply_to_status_id"):
-            referenced_tweets = {"type": "reply", "id": str(result.get("in_reply_to_status_id", ""))}
-        elif result.get("retweet_tweet_id") and result.get("retweet_status"):
-            retweet = result.get("retweet_status", {})
-            referenced_tweets = {"type": "retweet", **self._parse_tweet_without_ref(retweet)}
-            if retweet.get("quoted_status"):
-                quoted = retweet.get("quoted_status", {})
-                referenced_tweets["quoted_status"] = {"type": "quote", **self._parse_tweet_without_ref(quoted)}
-        elif result.get("quoted_status_id") and result.get("quoted_status"):
-            quoted = result.get("quoted_status", {})
-            referenced_tweets = {"type": "quote", **self._parse_tweet_without_ref(quoted)}
-
-        if referenced_tweets:
-            tweet["referenced_tweets"] = referenced_tweets
-
-        return tweet
+        return UserTweetRecord.from_result(result).to_dict()
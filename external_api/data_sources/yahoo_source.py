@@ -3,16 +3,43 @@ Yahoo Finance data source implementation
 """
 
 import asyncio
+import contextlib
 import logging
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiohttp
+import numpy as np
 
 from .base import BaseAPI
+from .cache import cached
+from .price_store import PriceStore, get_price_store
 
 logger = logging.getLogger("yahoo_finance_source")
 
+# Longest range (in days) a single intraday chart request accepts, longer ranges are split into windows
+INTRADAY_WINDOW_DAYS = {
+    "1m": 7,
+    "2m": 60,
+    "5m": 60,
+    "15m": 60,
+    "30m": 60,
+    "90m": 60,
+    "60m": 730,
+    "1h": 730,
+}
+# Max concurrent window requests for one chunked chart download
+CHART_CHUNK_CONCURRENCY = 4
+# Quote fields kept when merging windows
+QUOTE_FIELDS = ("open", "high", "low", "close", "volume")
+# Intervals served from the local price store when it is enabled, weekly/monthly bars are aligned to the
+# requested range upstream so they are always fetched
+PRICE_STORE_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d"}
+
+# Session shared by the section requests of a company snapshot
+_shared_session: ContextVar[Optional[aiohttp.ClientSession]] = ContextVar("yahoo_shared_session", default=None)
+
 
 class YahooFinanceSource(BaseAPI):
     """Yahoo Finance API data source implementation"""
@@ -42,6 +69,29 @@ class YahooFinanceSource(BaseAPI):
         """
         return "yahoo_finance"
 
+    @contextlib.asynccontextmanager
+    async def _session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Session for one request, reuses the shared session of a snapshot when there is one"""
+        session = _shared_session.get()
+        if session is not None and not session.closed:
+            yield session
+            return
+        async with aiohttp.ClientSession(trust_env=True) as session:
+            yield session
+
+    @contextlib.asynccontextmanager
+    async def _shared_session_scope(self) -> AsyncIterator[None]:
+        """Share one session between all requests issued inside this scope, including concurrent tasks"""
+        if _shared_session.get() is not None:
+            yield
+            return
+        async with aiohttp.ClientSession(trust_env=True) as session:
+            token = _shared_session.set(session)
+            try:
+                yield
+            finally:
+                _shared_session.reset(token)
+
     def get_api_info(self) -> Dict[str, Any]:
         """Get basic information about the data source
 
@@ -53,6 +103,7 @@ class YahooFinanceSource(BaseAPI):
             "description": "Yahoo Finance data source, providing stock price and company information query and stock related news query",
         }
 
+    @cached(ttl=300)
     async def get_stock_price(
         self,
         symbol: str,
@@ -60,9 +111,11 @@ class YahooFinanceSource(BaseAPI):
         end_date: str,
         interval: str = "1d",
         events: str = "",
+        columnar: bool = False,
     ) -> Dict[str, Any]:
         """Get stock price data. Please set start_date, end_date, interval reasonably to avoid getting too much data,
-        which could cause request timeout or performance issues.
+        which could cause request timeout or performance issues. Long intraday ranges are split into windows
+        the upstream accepts and downloaded concurrently.
 
         Args:
             symbol: Stock code
@@ -70,6 +123,8 @@ class YahooFinanceSource(BaseAPI):
             end_date: End date in YYYY-MM-DD format
             interval: Time interval, options: 1m|2m|5m|15m|30m|60m|1d|1wk|1mo, default: 1d
             events: Event type, options: capitalGain|div|split|earn|history, default: empty
+            columnar: Return NumPy arrays keyed by timestamp/date/open/high/low/close/volume under "columns"
+                instead of the "prices" list, recommended for large intraday data, default: False
 
         Returns:
             Dict[str, Any]: Dictionary containing stock price data, e.g.
@@ -106,54 +161,21 @@ class YahooFinanceSource(BaseAPI):
             if start_timestamp > end_timestamp:
                 raise ValueError("start_date cannot be greater than end_date")
 
-            # Build request parameters
-            params = {
-                "symbol": symbol,
-                "period1": start_timestamp,
-                "period2": end_timestamp,
-                "interval": interval,
-                "region": "US",  # Default use US area
-                "includePrePost": "false",
-                "useYfid": "true",
-                "includeAdjustedClose": "true",
-            }
-
-            # If events parameter is provided, add to request
-            if events:
-                params["events"] = events
-
-            request_url = f"{self.proxy_url}/stock/v3/get-chart"
-
-            # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # Parse the response
-                    data = await response.json()
+            store = get_price_store()
+            if store is not None and not events and interval in PRICE_STORE_INTERVALS:
+                chart = await self._fetch_chart_stored(store, symbol, start_timestamp, end_timestamp, interval)
+            else:
+                chart = await self._fetch_chart_range(symbol, start_timestamp, end_timestamp, interval, events)
+            if not chart["success"]:
+                return chart
 
-            # Check if there is an error in API response
-            if data.get("chart", {}).get("error"):
-                return {"success": False, "error": str(data["chart"]["error"])}
+            timestamps = chart["data"]["timestamps"]
+            quote = chart["data"]["quote"]
 
-            # Parse response data
-            chart_data = data["chart"]["result"][0]
-            timestamps = chart_data["timestamp"]
-            quote = chart_data["indicators"]["quote"][0]
-
-            # Build price data list
-            prices = []
-            for i, timestamp in enumerate(timestamps):
-                price_data = {
-                    "date": datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d"),
-                    "open": quote["open"][i],
-                    "high": quote["high"][i],
-                    "low": quote["low"][i],
-                    "close": quote["close"][i],
-                    "volume": int(quote["volume"][i]),
-                }
-                prices.append(price_data)
+            if columnar:
+                return {"success": True, "data": {"symbol": symbol, "columns": self._build_price_columns(timestamps, quote)}}
 
-            return {"success": True, "data": {"symbol": symbol, "prices": prices}}
+            return {"success": True, "data": {"symbol": symbol, "prices": self._build_price_records(timestamps, quote)}}
 
         except asyncio.TimeoutError:
             error_msg = f"Request timeout (timeout={self._timeout}s)"
@@ -168,6 +190,165 @@ class YahooFinanceSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": f"Unknown error: {str(e)}"}
 
+    async def _fetch_chart_stored(
+        self, store: PriceStore, symbol: str, start_timestamp: int, end_timestamp: int, interval: str
+    ) -> Dict[str, Any]:
+        """Serve chart data from the local price store, only requesting the ranges it does not cover yet
+
+        Returns:
+            Dict[str, Any]: Same as _fetch_chart
+        """
+        missing = await asyncio.to_thread(store.missing_ranges, symbol, interval, start_timestamp, end_timestamp)
+        chunks = await asyncio.gather(
+            *(
+                self._fetch_chart_range(symbol, range_start, range_end, interval, "", allow_empty=True)
+                for range_start, range_end in missing
+            )
+        )
+        for chunk in chunks:
+            if not chunk["success"]:
+                return chunk
+
+        for (range_start, range_end), chunk in zip(missing, chunks):
+            await asyncio.to_thread(
+                store.save, symbol, interval, range_start, range_end, chunk["data"]["timestamps"], chunk["data"]["quote"]
+            )
+
+        timestamps, quote = await asyncio.to_thread(store.load, symbol, interval, start_timestamp, end_timestamp)
+        logger.info(f"Loaded {len(timestamps)} bars for {symbol} ({interval}) from price store, fetched {len(missing)} missing ranges")
+        return {"success": True, "data": {"timestamps": timestamps, "quote": quote}}
+
+    async def _fetch_chart_range(
+        self, symbol: str, start_timestamp: int, end_timestamp: int, interval: str, events: str, allow_empty: bool = False
+    ) -> Dict[str, Any]:
+        """Request chart data for a time range, splitting long intraday ranges into concurrent window requests
+
+        Returns:
+            Dict[str, Any]: Same as _fetch_chart, bars are merged in chronological order without duplicates
+        """
+        window_days = INTRADAY_WINDOW_DAYS.get(interval)
+        if window_days is None or end_timestamp - start_timestamp <= window_days * 86400:
+            return await self._fetch_chart(symbol, start_timestamp, end_timestamp, interval, events, allow_empty=allow_empty)
+
+        window = window_days * 86400
+        windows = [
+            (window_start, min(window_start + window, end_timestamp))
+            for window_start in range(start_timestamp, end_timestamp, window)
+        ]
+        semaphore = asyncio.Semaphore(CHART_CHUNK_CONCURRENCY)
+
+        async def fetch_window(window_start: int, window_end: int) -> Dict[str, Any]:
+            async with semaphore:
+                # Windows covering weekends or holidays have no bars
+                return await self._fetch_chart(symbol, window_start, window_end, interval, events, allow_empty=True)
+
+        chunks = await asyncio.gather(*(fetch_window(window_start, window_end) for window_start, window_end in windows))
+        for chunk in chunks:
+            if not chunk["success"]:
+                return chunk
+
+        # Adjacent windows share their boundary, keep the first bar seen for each timestamp
+        bars: Dict[int, tuple] = {}
+        for chunk in chunks:
+            quote = chunk["data"]["quote"]
+            for i, timestamp in enumerate(chunk["data"]["timestamps"]):
+                if timestamp not in bars:
+                    bars[timestamp] = tuple(quote[field][i] for field in QUOTE_FIELDS)
+
+        timestamps = sorted(bars)
+        quote = {field: [bars[timestamp][j] for timestamp in timestamps] for j, field in enumerate(QUOTE_FIELDS)}
+        logger.info(f"Merged {len(windows)} chart windows for {symbol} ({interval}): {len(timestamps)} bars")
+        return {"success": True, "data": {"timestamps": timestamps, "quote": quote}}
+
+    async def _fetch_chart(
+        self, symbol: str, start_timestamp: int, end_timestamp: int, interval: str, events: str, allow_empty: bool = False
+    ) -> Dict[str, Any]:
+        """Request chart data for a time range, with allow_empty a range without bars yields an empty series instead of an error
+
+        Returns:
+            Dict[str, Any]: {"success": True, "data": {"timestamps": [...], "quote": {...}}} or {"success": False, "error": ...}
+        """
+        # Build request parameters
+        params = {
+            "symbol": symbol,
+            "period1": start_timestamp,
+            "period2": end_timestamp,
+            "interval": interval,
+            "region": "US",  # Default use US area
+            "includePrePost": "false",
+            "useYfid": "true",
+            "includeAdjustedClose": "true",
+        }
+
+        # If events parameter is provided, add to request
+        if events:
+            params["events"] = events
+
+        request_url = f"{self.proxy_url}/stock/v3/get-chart"
+
+        # Send request using aiohttp
+        async with self._session() as session:
+            async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
+                response.raise_for_status()
+                # Parse the response
+                data = await response.json()
+
+        # Check if there is an error in API response
+        if data.get("chart", {}).get("error"):
+            return {"success": False, "error": str(data["chart"]["error"])}
+
+        # Parse response data
+        chart_data = data["chart"]["result"][0]
+        if allow_empty and "timestamp" not in chart_data:
+            return {"success": True, "data": {"timestamps": [], "quote": {field: [] for field in QUOTE_FIELDS}}}
+        return {"success": True, "data": {"timestamps": chart_data["timestamp"], "quote": chart_data["indicators"]["quote"][0]}}
+
+    def _build_price_records(self, timestamps: List[int], quote: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """Build the per-bar price list"""
+        prices = []
+        for i, timestamp in enumerate(timestamps):
+            price_data = {
+                "date": datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d"),
+                "open": quote["open"][i],
+                "high": quote["high"][i],
+                "low": quote["low"][i],
+                "close": quote["close"][i],
+                "volume": int(quote["volume"][i]),
+            }
+            prices.append(price_data)
+        return prices
+
+    def _build_price_columns(self, timestamps: List[int], quote: Dict[str, List[Any]]) -> Dict[str, np.ndarray]:
+        """Build price columns as NumPy arrays, missing prices become NaN and missing volumes become 0"""
+        timestamp_array = np.asarray(timestamps, dtype=np.int64)
+        volume = np.asarray(quote["volume"], dtype=np.float64)
+        return {
+            "timestamp": timestamp_array,
+            "date": self._format_dates(timestamp_array),
+            "open": np.asarray(quote["open"], dtype=np.float64),
+            "high": np.asarray(quote["high"], dtype=np.float64),
+            "low": np.asarray(quote["low"], dtype=np.float64),
+            "close": np.asarray(quote["close"], dtype=np.float64),
+            "volume": np.nan_to_num(volume).astype(np.int64),
+        }
+
+    def _format_dates(self, timestamps: np.ndarray) -> np.ndarray:
+        """Vectorized datetime.fromtimestamp(ts).strftime("%Y-%m-%d") in local time"""
+        if timestamps.size == 0:
+            return np.array([], dtype="<U10")
+
+        # UTC offsets only change on hour boundaries, so look them up once per distinct hour
+        hours, inverse = np.unique(timestamps // 3600, return_inverse=True)
+        offsets = np.array([self._utc_offset(int(hour) * 3600) for hour in hours], dtype=np.int64)
+        local_timestamps = timestamps + offsets[inverse.reshape(-1)]
+        return np.datetime_as_string(local_timestamps.astype("datetime64[s]"), unit="D")
+
+    def _utc_offset(self, timestamp: int) -> int:
+        """Local UTC offset in seconds at the given timestamp"""
+        offset = datetime.fromtimestamp(timestamp).astimezone().utcoffset()
+        return int(offset.total_seconds()) if offset else 0
+
+    @cached(ttl=600)
     async def get_stock_news(self, symbol: str, region: str = "US", snippet_count: int = 10) -> Dict[str, Any]:
         """获取股票相关的新闻数据
         Args:
@@ -204,7 +385,7 @@ class YahooFinanceSource(BaseAPI):
 
             # 发送POST请求
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
+                async with self._session() as session:
                     # 使用POST请求，并设置空数据体
                     async with session.post(
                         request_url,
@@ -315,6 +496,7 @@ class YahooFinanceSource(BaseAPI):
                     tickers.append(ticker_data["symbol"])
         return tickers
 
+    @cached(ttl=300)
     async def get_stock_info(self, symbol: str) -> Dict[str, Any]:
         """Get basic stock information
 
@@ -356,7 +538,7 @@ class YahooFinanceSource(BaseAPI):
 
             # Send request
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
+                async with self._session() as session:
                     async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                         response.raise_for_status()
                         data = await response.json()
@@ -416,8 +598,10 @@ class YahooFinanceSource(BaseAPI):
         end_date: str,
         interval: str = "1d",
         events: str = "",
+        max_concurrency: int = 8,
+        symbol_timeout: Optional[float] = None,
     ) -> Dict[str, Any]:
-        """Get price data for multiple stocks
+        """Get price data for multiple stocks, requests for different stocks are sent concurrently
 
         Args:
             symbols(List[str]): Stock code list
@@ -425,6 +609,8 @@ class YahooFinanceSource(BaseAPI):
             end_date(str): End date in YYYY-MM-DD format
             interval(str): Time interval, options: 1m|2m|5m|15m|30m|60m|1d|1wk|1mo, default: 1d
             events(str): Event type, options: capitalGain|div|split|earn|history, default: empty
+            max_concurrency(int): Maximum number of stocks requested at the same time, default: 8
+            symbol_timeout(Optional[float]): Timeout in seconds for each stock, default: None (use the request timeout)
 
         Returns:
             Dict[str, Any]: Dictionary containing stock price data, e.g.
@@ -468,22 +654,30 @@ class YahooFinanceSource(BaseAPI):
         try:
             stocks_data = []
             failed_symbols = []
-
-            # Iterate over stock code list to get data for each stock
-            for symbol in symbols:
-                try:
-                    result = await self.get_stock_price(
-                        symbol=symbol, start_date=start_date, end_date=end_date, interval=interval, events=events
-                    )
-                    if result["success"]:
-                        stocks_data.append(result["data"])
-                    else:
-                        failed_symbols.append((symbol, result["error"]))
-                        logger.warning(f"Failed to get data for stock {symbol}: {result['error']}")
-                except Exception as e:
-                    failed_symbols.append((symbol, str(e)))
-                    logger.error(f"Error occurred while getting data for stock {symbol}: {str(e)}")
-                    logger.exception(e)
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def fetch_stock_price(symbol: str) -> Dict[str, Any]:
+                async with semaphore:
+                    try:
+                        return await asyncio.wait_for(
+                            self.get_stock_price(symbol=symbol, start_date=start_date, end_date=end_date, interval=interval, events=events),
+                            timeout=symbol_timeout,
+                        )
+                    except asyncio.TimeoutError:
+                        return {"success": False, "error": f"Request timeout (timeout={symbol_timeout}s)"}
+
+            # Fetch all stocks concurrently, results keep the order of the stock code list
+            results = await asyncio.gather(*(fetch_stock_price(symbol) for symbol in symbols), return_exceptions=True)
+
+            for symbol, result in zip(symbols, results):
+                if isinstance(result, Exception):
+                    failed_symbols.append((symbol, str(result)))
+                    logger.error(f"Error occurred while getting data for stock {symbol}: {str(result)}", exc_info=result)
+                elif result["success"]:
+                    stocks_data.append(result["data"])
+                else:
+                    failed_symbols.append((symbol, result["error"]))
+                    logger.warning(f"Failed to get data for stock {symbol}: {result['error']}")
 
             # If all stocks fail to get data
             if len(failed_symbols) == len(symbols):
@@ -505,6 +699,7 @@ class YahooFinanceSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": str(e)}
 
+    @cached(ttl=3600)
     async def get_stock_insights(self, symbol: str) -> Dict[str, Any]:
         """Get stock insight data, including technical analysis, valuation, and company snapshot
 
@@ -568,7 +763,7 @@ class YahooFinanceSource(BaseAPI):
             params = {"symbol": symbol}
 
             # Send request
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self._session() as session:
                 try:
                     async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                         # Check response status
@@ -634,6 +829,7 @@ class YahooFinanceSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": str(e)}
 
+    @cached(ttl=3600)
     async def get_stock_statistics(self, symbol: str, region: Optional[str] = None, lang: Optional[str] = None) -> Dict[str, Any]:
         """Get stock statistics data, including valuation metrics, financial ratios, and shareholder information
 
@@ -709,7 +905,7 @@ class YahooFinanceSource(BaseAPI):
                 params["lang"] = lang
 
             # Send request
-            async with aiohttp.ClientSession(trust_env=True) as session:
+            async with self._session() as session:
                 try:
                     async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                         # Check response status
@@ -772,6 +968,7 @@ class YahooFinanceSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": str(e)}
 
+    @cached(ttl=3600)
     async def get_financial_data(self, symbol: str) -> Dict[str, Any]:
         """Get stock financial data
 
@@ -852,7 +1049,7 @@ class YahooFinanceSource(BaseAPI):
 
             # Send request
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
+                async with self._session() as session:
                     async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
                         response.raise_for_status()
                         data = await response.json()
@@ -928,3 +1125,125 @@ class YahooFinanceSource(BaseAPI):
             logger.error(error_msg)
             logger.exception(e)
             return {"success": False, "error": error_msg}
+
+    async def get_company_snapshot(self, symbol: str, news_count: int = 10) -> Dict[str, Any]:
+        """Get a company snapshot: basic info, insights, statistics, financial data and news are requested concurrently
+        on one shared session, sections that fail are reported in failed_sections
+
+        Args:
+            symbol(str): Stock code
+            news_count(int): Number of news items to return, default: 10
+
+        Returns:
+            Dict[str, Any]: Dictionary containing the snapshot, each section has the same content as the "data" of the
+            corresponding method (get_stock_info, get_stock_insights, get_stock_statistics, get_financial_data,
+            get_stock_news), a failed section is None, e.g.
+            {
+                "success": True,
+                "data": {
+                    "symbol": "AAPL",
+                    "info": {...},
+                    "insights": {...},
+                    "statistics": {...},
+                    "financials": {...},
+                    "news": None,
+                    "failed_sections": [
+                        {"section": "news", "error": "Request timeout (timeout=60s)"}
+                    ]
+                }
+            }
+        """
+        try:
+            async with self._shared_session_scope():
+                sections = {
+                    "info": self.get_stock_info(symbol),
+                    "insights": self.get_stock_insights(symbol),
+                    "statistics": self.get_stock_statistics(symbol),
+                    "financials": self.get_financial_data(symbol),
+                    "news": self.get_stock_news(symbol, snippet_count=news_count),
+                }
+                results = await asyncio.gather(*sections.values(), return_exceptions=True)
+
+            snapshot = {"symbol": symbol}
+            failed_sections = []
+            for section, result in zip(sections, results):
+                if isinstance(result, Exception):
+                    error = str(result)
+                    logger.error(f"Error occurred while getting {section} of stock {symbol}: {error}", exc_info=result)
+                elif result["success"]:
+                    snapshot[section] = result["data"]
+                    continue
+                else:
+                    error = result["error"]
+                    logger.warning(f"Failed to get {section} of stock {symbol}: {error}")
+                snapshot[section] = None
+                failed_sections.append({"section": section, "error": error})
+
+            # If all sections fail to get data
+            if len(failed_sections) == len(sections):
+                error_msg = f"All sections of stock {symbol} failed:\n" + "\n".join(
+                    [f"{failed['section']}: {failed['error']}" for failed in failed_sections]
+                )
+                return {"success": False, "error": error_msg}
+
+            snapshot["failed_sections"] = failed_sections
+            return {"success": True, "data": snapshot}
+
+        except Exception as e:
+            logger.error(f"Error occurred while getting company snapshot: {str(e)}")
+            logger.exception(e)
+            return {"success": False, "error": str(e)}
+
+    async def get_companies_snapshot(self, symbols: List[str], news_count: int = 10, max_concurrency: int = 4) -> Dict[str, Any]:
+        """Get company snapshots for multiple stocks, all requests share one session
+
+        Args:
+            symbols(List[str]): Stock code list
+            news_count(int): Number of news items to return for each stock, default: 10
+            max_concurrency(int): Maximum number of stocks requested at the same time, default: 4
+
+        Returns:
+            Dict[str, Any]: Dictionary containing the snapshots, each item has the same content as the "data" of
+            get_company_snapshot, e.g.
+            {
+                "success": True,
+                "data": {
+                    "count": 1,
+                    "companies": [
+                        {"symbol": "AAPL", "info": {...}, "insights": {...}, "statistics": {...}, "financials": {...}, "news": {...}, "failed_sections": []}
+                    ],
+                    "failed_symbols": [
+                        {"symbol": "XXXX", "error": "All sections of stock XXXX failed: ..."}
+                    ]
+                }
+            }
+        """
+        try:
+            companies = []
+            failed_symbols = []
+            semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+            async def fetch_snapshot(symbol: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self.get_company_snapshot(symbol, news_count=news_count)
+
+            async with self._shared_session_scope():
+                results = await asyncio.gather(*(fetch_snapshot(symbol) for symbol in symbols))
+
+            for symbol, result in zip(symbols, results):
+                if result["success"]:
+                    companies.append(result["data"])
+                else:
+                    failed_symbols.append({"symbol": symbol, "error": result["error"]})
+
+            # If all stocks fail to get data
+            if symbols and len(failed_symbols) == len(symbols):
+                error_msg = "All company snapshots failed:\n" + "\n".join([f"{failed['symbol']}: {failed['error']}" for failed in failed_symbols])
+                return {"success": False, "error": error_msg}
+
+            return {"success": True, "data": {"count": len(companies), "companies": companies, "failed_symbols": failed_symbols}}
+
+        except Exception as e:
+            logger.error(f"Error occurred while batch getting company snapshots: {str(e)}")
+            logger.exception(e)
+            return {"success": False, "error": str(e)}
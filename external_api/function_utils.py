@@ -1,8 +1,11 @@
 import asyncio
+import contextlib
 import json
 import os
+import pickle
+import threading
 import uuid
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional, Tuple, cast
 
 import aiohttp
 from pydantic import BaseModel
@@ -10,10 +13,35 @@ from pydantic import BaseModel
 ENV_AGENT_NAME = "AGENT_NAME"
 ENV_FUNC_SERVER_PORT = "FUNC_SERVER_PORT"
 MCP_FUNCTION_LIST_JSON_FILE = "mcp_function_list.json"
+FUNCTION_LIST_CACHE_SUFFIX = ".cache"
+FUNCTION_LIST_CACHE_VERSION = 1
 
 SERVER_PORT = 12306
 PROXY_TIMEOUT = 3600
 
+# 连接池配置，可通过环境变量覆盖
+ENV_PROXY_POOL_LIMIT = "FUNC_PROXY_POOL_LIMIT"
+ENV_PROXY_POOL_LIMIT_PER_HOST = "FUNC_PROXY_POOL_LIMIT_PER_HOST"
+ENV_PROXY_KEEPALIVE_TIMEOUT = "FUNC_PROXY_KEEPALIVE_TIMEOUT"
+
+POOL_LIMIT = 100
+POOL_LIMIT_PER_HOST = 100
+POOL_KEEPALIVE_TIMEOUT = 30
+
+# 每个事件循环一个共享 session: id(loop) -> (loop, session, closer)
+# session 和 connector 都强引用所属的 loop，不能用弱引用字典自动清理；已关闭的 loop 在下次获取 session 时移除
+_sessions: Dict[int, Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession, AsyncGenerator[None, None]]] = {}
+_sessions_lock = threading.Lock()
+
+# 服务端不支持 /execute_batch 时返回的状态码，命中后该服务退化为并发单次调用
+BATCH_UNSUPPORTED_STATUS = (404, 405, 501)
+_batch_unsupported_urls: set[str] = set()
+
+# 流式返回支持的格式
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+SSE_CONTENT_TYPE = "text/event-stream"
+SSE_DONE = b"[DONE]"
+
 
 class ToolResult(BaseModel):
     """工具结果"""
@@ -22,6 +50,60 @@ class ToolResult(BaseModel):
     is_error: bool
 
 
+def _create_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=int(os.environ.get(ENV_PROXY_POOL_LIMIT, POOL_LIMIT)),
+        limit_per_host=int(os.environ.get(ENV_PROXY_POOL_LIMIT_PER_HOST, POOL_LIMIT_PER_HOST)),
+        keepalive_timeout=float(os.environ.get(ENV_PROXY_KEEPALIVE_TIMEOUT, POOL_KEEPALIVE_TIMEOUT)),
+    )
+    return aiohttp.ClientSession(connector=connector, trust_env=True)
+
+
+async def _close_on_loop_shutdown(session: aiohttp.ClientSession) -> AsyncGenerator[None, None]:
+    # 事件循环会跟踪已启动的异步生成器，asyncio.run 在关闭循环前调用 loop.shutdown_asyncgens() 关闭它们，
+    # 借此在循环结束时关闭共享 session，即使调用方没有调用 close_shared_session
+    try:
+        yield
+    finally:
+        if not session.closed:
+            await session.close()
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """
+    获取当前事件循环共享的 ClientSession，所有 FunctionProxy 复用同一个连接池
+
+    通过 asyncio.run 运行的循环结束时会自动关闭 session；长期运行的服务（例如自行管理事件循环、
+    不调用 shutdown_asyncgens 的场景）需要在循环结束前 await close_shared_session()
+    """
+    loop = asyncio.get_running_loop()
+    with _sessions_lock:
+        # 没有经过上述关闭流程就结束的 loop 已无法再执行 session.close()，这里只移除引用
+        for loop_id, (session_loop, _, _) in list(_sessions.items()):
+            if session_loop.is_closed():
+                del _sessions[loop_id]
+
+        entry = _sessions.get(id(loop))
+        if entry is None or entry[1].closed:
+            session = _create_session()
+            closer = _close_on_loop_shutdown(session)
+            # 推进到 yield，使当前循环开始跟踪该生成器
+            with contextlib.suppress(StopIteration):
+                closer.asend(None).send(None)
+            entry = (loop, session, closer)
+            _sessions[id(loop)] = entry
+        return entry[1]
+
+
+async def close_shared_session() -> None:
+    """关闭当前事件循环的共享 ClientSession，进程退出或事件循环结束前调用"""
+    loop = asyncio.get_running_loop()
+    with _sessions_lock:
+        entry = _sessions.pop(id(loop), None)
+    if entry is not None:
+        await entry[2].aclose()
+
+
 class FunctionProxy:
     def __init__(self, function_info: Dict[str, Any]):
         self.name: str = function_info["name"]
@@ -39,6 +121,63 @@ class FunctionProxy:
         return f"http://localhost:{self.server_port}"
 
     async def __call__(self, *args, **kwargs) -> ToolResult:
+        request = self._build_request(self._build_call_params(args, kwargs))
+
+        # 发出请求前的拦截
+        tool_result = self._intercept_request(self.name, request)
+        if tool_result is not None:
+            return tool_result
+
+        return await self._execute(request)
+
+    async def stream(self, *args, **kwargs) -> AsyncIterator[ToolResult]:
+        """
+        流式调用函数，服务端以 NDJSON 或 SSE 返回时逐个产出 ToolResult 片段
+
+        服务端不支持流式返回时，产出一个完整的 ToolResult
+        """
+        request = self._build_request(self._build_call_params(args, kwargs))
+        request["stream"] = True
+
+        # 发出请求前的拦截
+        tool_result = self._intercept_request(self.name, request)
+        if tool_result is not None:
+            yield tool_result
+            return
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        headers = {"Accept": f"{NDJSON_CONTENT_TYPE}, {SSE_CONTENT_TYPE}, application/json"}
+        try:
+            session = get_shared_session()
+            async with session.post(f"{self.get_server_url()}/execute", json=request, headers=headers, timeout=timeout) as response:
+                if response.status != 200:
+                    yield ToolResult(is_error=True, message=f"Function call failed: {await response.text()}")
+                    return
+
+                if response.content_type == NDJSON_CONTENT_TYPE:
+                    fragments = _iter_ndjson(response)
+                elif response.content_type == SSE_CONTENT_TYPE:
+                    fragments = _iter_sse(response)
+                else:
+                    yield self._to_tool_result(request, await response.json())
+                    return
+
+                async for fragment in fragments:
+                    yield self._to_tool_result(request, fragment)
+        except asyncio.TimeoutError:
+            error_msg = f"Timeout when calling function {self.name}"
+            yield ToolResult(is_error=True, message=error_msg)
+        except Exception as e:
+            import traceback
+
+            error_msg = f"Error: {str(e)}\nTraceback:\n{traceback.format_exc()}"
+            yield ToolResult(is_error=True, message=error_msg)
+
+    async def batch(self, calls: List[Dict[str, Any]]) -> List[ToolResult]:
+        """批量调用当前函数，calls 中每一项是一次调用的参数字典，按顺序返回每次调用的结果"""
+        return await call_many([(self, call_params) for call_params in calls])
+
+    def _build_call_params(self, args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
         call_params = kwargs.copy()
         args_len = len(args)
 
@@ -50,7 +189,10 @@ class FunctionProxy:
                 if i < self.params_len:
                     call_params[self.params[i]["name"]] = args[i]
 
-        request = {
+        return call_params
+
+    def _build_request(self, call_params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
             "request_id": str(uuid.uuid4()),
             "function_name": self.origin_name or self.name,
             "function_kind": self.kind,
@@ -58,32 +200,31 @@ class FunctionProxy:
             "parameters": call_params,
         }
 
-        # 发出请求前的拦截
-        tool_result = self._intercept_request(self.name, request)
-        if tool_result is not None:
-            return tool_result
-
+    async def _execute(self, request: Dict[str, Any]) -> ToolResult:
         timeout = aiohttp.ClientTimeout(total=self.timeout)
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            try:
-                async with session.post(f"{self.get_server_url()}/execute", json=request) as response:
-                    if response.status != 200:
-                        return ToolResult(is_error=True, message=f"Function call failed: {await response.text()}")
+        try:
+            session = get_shared_session()
+            async with session.post(f"{self.get_server_url()}/execute", json=request, timeout=timeout) as response:
+                if response.status != 200:
+                    return ToolResult(is_error=True, message=f"Function call failed: {await response.text()}")
 
-                    result = await response.json()
-                    if result.get("is_error", False):
-                        return ToolResult(is_error=True, message=result.get("message", "Unknown error"))
+                result = await response.json()
+                return self._to_tool_result(request, result)
+        except asyncio.TimeoutError:
+            error_msg = f"Timeout when calling function {self.name}"
+            return ToolResult(is_error=True, message=error_msg)
+        except Exception as e:
+            import traceback
 
-                    tool_result = ToolResult(is_error=False, message=result.get("message", "succeed"))
-                    return self._intercept_response(self.name, request, tool_result)
-            except asyncio.TimeoutError:
-                error_msg = f"Timeout when calling function {self.name}"
-                return ToolResult(is_error=True, message=error_msg)
-            except Exception as e:
-                import traceback
+            error_msg = f"Error: {str(e)}\nTraceback:\n{traceback.format_exc()}"
+            return ToolResult(is_error=True, message=error_msg)
 
-                error_msg = f"Error: {str(e)}\nTraceback:\n{traceback.format_exc()}"
-                return ToolResult(is_error=True, message=error_msg)
+    def _to_tool_result(self, request: Dict[str, Any], result: Dict[str, Any]) -> ToolResult:
+        if result.get("is_error", False):
+            return ToolResult(is_error=True, message=result.get("message", "Unknown error"))
+
+        tool_result = ToolResult(is_error=False, message=result.get("message", "succeed"))
+        return self._intercept_response(self.name, request, tool_result)
 
     def _intercept_request(self, function_name: str, request: Dict[str, Any]) -> Optional[ToolResult]:
         if self.kind == "agent" and self.agent_name and "planner" not in self.agent_name:
@@ -97,14 +238,189 @@ class FunctionProxy:
         return result
 
 
-def load_function_proxys(file_path: str) -> tuple[List[Dict[str, Any]], Dict[str, FunctionProxy]]:
-    # 加载 function_list.json 并创建 function proxies
+async def _iter_lines(response: aiohttp.ClientResponse) -> AsyncIterator[bytes]:
+    # 按块读取响应并切分成行，只缓存当前未结束的一行
+    buffer = bytearray()
+    async for chunk in response.content.iter_any():
+        buffer.extend(chunk)
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            yield bytes(buffer[start:end]).rstrip(b"\r")
+            start = end + 1
+        del buffer[:start]
+    if buffer:
+        yield bytes(buffer).rstrip(b"\r")
+
+
+async def _iter_ndjson(response: aiohttp.ClientResponse) -> AsyncIterator[Dict[str, Any]]:
+    async for line in _iter_lines(response):
+        if line.strip():
+            yield json.loads(line)
+
+
+async def _iter_sse(response: aiohttp.ClientResponse) -> AsyncIterator[Dict[str, Any]]:
+    # 一个事件可以包含多行 data，遇到空行时结束
+    data_lines: List[bytes] = []
+    async for line in _iter_lines(response):
+        if line.startswith(b"data:"):
+            data_lines.append(line[5:].lstrip(b" "))
+            continue
+        if line or not data_lines:
+            continue
+
+        data = b"\n".join(data_lines)
+        data_lines = []
+        if data != SSE_DONE:
+            yield json.loads(data)
+
+    if data_lines and b"\n".join(data_lines) != SSE_DONE:
+        yield json.loads(b"\n".join(data_lines))
+
+
+async def call_many(calls: List[Tuple[FunctionProxy, Dict[str, Any]]]) -> List[ToolResult]:
+    """
+    批量调用多个函数，calls 中每一项为 (FunctionProxy, 参数字典)
+
+    同一个服务的调用合并为一次 /execute_batch 请求；服务不支持批量接口时，退化为并发的单次调用。
+    返回结果与 calls 顺序一一对应。
+    """
+    results: List[Optional[ToolResult]] = [None] * len(calls)
+    batches: Dict[str, List[Tuple[int, FunctionProxy, Dict[str, Any]]]] = {}
+
+    for index, (proxy, call_params) in enumerate(calls):
+        request = proxy._build_request(call_params)
+
+        # 发出请求前的拦截
+        tool_result = proxy._intercept_request(proxy.name, request)
+        if tool_result is not None:
+            results[index] = tool_result
+            continue
+
+        try:
+            server_url = proxy.get_server_url()
+        except Exception as e:
+            results[index] = ToolResult(is_error=True, message=f"Error: {str(e)}")
+            continue
+        batches.setdefault(server_url, []).append((index, proxy, request))
+
+    batch_results = await asyncio.gather(*(_execute_batch(server_url, items) for server_url, items in batches.items()))
+    for items, item_results in zip(batches.values(), batch_results):
+        for (index, _, _), tool_result in zip(items, item_results):
+            results[index] = tool_result
+
+    return cast(List[ToolResult], results)
+
+
+async def _execute_batch(server_url: str, items: List[Tuple[int, FunctionProxy, Dict[str, Any]]]) -> List[ToolResult]:
+    if server_url not in _batch_unsupported_urls:
+        timeout = aiohttp.ClientTimeout(total=max(proxy.timeout for _, proxy, _ in items))
+        payload = {"requests": [request for _, _, request in items]}
+        try:
+            session = get_shared_session()
+            async with session.post(f"{server_url}/execute_batch", json=payload, timeout=timeout) as response:
+                if response.status in BATCH_UNSUPPORTED_STATUS:
+                    # 服务不支持批量接口，记录下来，之后直接走单次调用
+                    _batch_unsupported_urls.add(server_url)
+                elif response.status != 200:
+                    error_msg = f"Function call failed: {await response.text()}"
+                    return [ToolResult(is_error=True, message=error_msg) for _ in items]
+                else:
+                    result = await response.json()
+                    item_results = result.get("results", [])
+                    if len(item_results) != len(items):
+                        raise ValueError(f"Batch response size mismatch: expected {len(items)}, got {len(item_results)}")
+                    return [proxy._to_tool_result(request, item_result) for (_, proxy, request), item_result in zip(items, item_results)]
+        except asyncio.TimeoutError:
+            return [ToolResult(is_error=True, message=f"Timeout when calling function {proxy.name}") for _, proxy, _ in items]
+        except Exception as e:
+            import traceback
+
+            error_msg = f"Error: {str(e)}\nTraceback:\n{traceback.format_exc()}"
+            return [ToolResult(is_error=True, message=error_msg) for _ in items]
+
+    return list(await asyncio.gather(*(proxy._execute(request) for _, proxy, request in items)))
+
+
+def _function_list_cache_key(file_path: str) -> tuple:
+    stat = os.stat(file_path)
+    return (FUNCTION_LIST_CACHE_VERSION, os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def _read_function_list_cache(cache_path: str, key: tuple) -> Optional[tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]]:
+    try:
+        with open(cache_path, "rb") as f:
+            payload = pickle.load(f)
+    except Exception:
+        # 缓存不存在或已损坏，回退到解析 JSON
+        return None
+
+    if not isinstance(payload, dict) or payload.get("key") != key:
+        return None
+    return payload["function_list"], payload["function_infos"]
+
+
+def _write_function_list_cache(
+    cache_path: str, key: tuple, function_list: List[Dict[str, Any]], function_infos: Dict[str, Dict[str, Any]]
+) -> bool:
+    # 先写临时文件再替换，避免并发启动的进程读到写了一半的缓存
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"key": key, "function_list": function_list, "function_infos": function_infos}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        return True
+    except OSError:
+        # 目录只读等情况下不写缓存
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        return False
+
+
+def _parse_function_list(file_path: str) -> tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
     with open(file_path, "r", encoding="utf-8") as f:
         function_list = json.load(f)
 
-    proxies = {}
+    function_infos = {}
     for function_info in function_list:
         if isinstance(function_info, dict) and "name" in function_info:
-            proxies[function_info["name"]] = FunctionProxy(function_info)
+            function_infos[function_info["name"]] = function_info
+
+    return function_list, function_infos
+
+
+def load_function_infos(file_path: str) -> tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    # 加载 function_list.json，返回原始列表以及 name -> function_info 的映射
+    # 解析结果缓存在同目录的 sidecar 文件中，JSON 文件的 mtime 或大小变化后自动重建
+    # 注意：external_api 包在首次访问任意包属性时（包括 external_api.__all__）都会调用这里，
+    # 缓存不存在或已失效时会在包目录下写入 mcp_function_list.json.cache；目录不可写时只跳过写入
+    cache_path = file_path + FUNCTION_LIST_CACHE_SUFFIX
+    key = _function_list_cache_key(file_path)
+
+    cached = _read_function_list_cache(cache_path, key)
+    if cached is not None:
+        return cached
+
+    function_list, function_infos = _parse_function_list(file_path)
+    _write_function_list_cache(cache_path, key, function_list, function_infos)
+    return function_list, function_infos
+
+
+def prewarm_function_list_cache(file_path: str) -> Dict[str, Dict[str, Any]]:
+    # 重新解析 function_list.json 并写入缓存，用于部署时预热
+    key = _function_list_cache_key(file_path)
+    function_list, function_infos = _parse_function_list(file_path)
+    if not _write_function_list_cache(file_path + FUNCTION_LIST_CACHE_SUFFIX, key, function_list, function_infos):
+        raise OSError(f"Failed to write function list cache for {file_path}")
+    return function_infos
+
+
+def load_function_proxys(file_path: str) -> tuple[List[Dict[str, Any]], Dict[str, FunctionProxy]]:
+    # 加载 function_list.json 并创建 function proxies
+    function_list, function_infos = load_function_infos(file_path)
+
+    proxies = {}
+    for name, function_info in function_infos.items():
+        proxies[name] = FunctionProxy(function_info)
 
     return function_list, proxies
+